@@ -0,0 +1,60 @@
+# ✅ **Add a Book with Cover Upload**
+import streamlit as st
+import os
+from library_core import (
+    Book, COVERS_DIR, DUPLICATE_POLICY, cover_index, read_cover, shared_storage, span, thumbnail_cache,
+)
+
+storage = shared_storage()
+
+st.subheader("➕ Add a New Book")
+
+# Card-style form for adding a book
+with st.container():
+    st.markdown("""
+    <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+        <h3 style="color: #2c3e50; text-align: center;">Add Book</h3>
+    </div>
+    """, unsafe_allow_html=True)
+
+title = st.text_input("📘 Book Title")
+author = st.text_input("✍️ Author")
+year = st.number_input("📅 Publication Year", min_value=0, step=1)
+genre = st.text_input("📂 Genre")
+read_status = st.checkbox("✔️ Read")
+cover = st.file_uploader("🖼️ Upload Book Cover (optional)", type=["png", "jpg", "jpeg"])
+
+if st.button("✅ Add Book"):
+    if title.strip() == "" or author.strip() == "" or genre.strip() == "":
+        st.error("⚠️ Please fill in all fields (Title, Author, and Genre are required).")
+    elif DUPLICATE_POLICY == "skip" and storage.duplicate_of(Book(title, author, int(year))) is not None:
+        # Skipped either way; checked first so the library's copy keeps its cover file
+        st.warning(f'⚠️ "{title}" by {author} ({int(year)}) is already in the library.')
+    else:
+        book = Book(title, author, int(year), genre, read_status, "")
+        try:
+            # Checked before anything is written, so a bad upload leaves no file behind
+            thumbnail, hash_value = read_cover(cover) if cover else (None, None)
+        except ValueError:
+            st.error("⚠️ The cover could not be read as an image. Please upload a PNG or JPEG file.")
+        else:
+            with span("covers: save"):
+                if cover:
+                    covers_dir = COVERS_DIR
+                    if not os.path.exists(covers_dir):
+                        os.makedirs(covers_dir)
+                    cover_path = os.path.join(covers_dir, f"{title.replace(' ', '_')}.jpg")
+                    with open(cover_path, "wb") as f:
+                        f.write(cover.getbuffer())
+                    thumbnail_cache().put(cover_path, thumbnail)
+                    cover_index().put(cover_path, hash_value)
+                    book.cover = cover_path
+            # The library's duplicate policy decides what happens to a book it already has
+            if not storage.add(book):
+                st.success(f'📖 Book "{title}" added successfully!')
+            elif DUPLICATE_POLICY == "merge":
+                st.success(f'📖 "{title}" by {author} ({int(year)}) was already in the library; its empty fields were filled in.')
+            elif DUPLICATE_POLICY == "replace":
+                st.success(f'📖 "{title}" by {author} ({int(year)}) was already in the library and has been replaced.')
+            else:
+                st.warning(f'⚠️ "{title}" by {author} ({int(year)}) is already in the library.')
@@ -0,0 +1,85 @@
+# ✅ **Display Books in Card Format or Table Format**
+import streamlit as st
+import numpy as np
+from library_core import CARD_PAGE_SIZES, TABLE_PAGE_SIZES, shared_storage, span, thumbnail_cache
+
+storage = shared_storage()
+
+# Page size and page number pickers for a listing; returns the page, its size and the listing's length
+def page_picker(listing, page_sizes, default):
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("📄 Books per page", page_sizes, index=default)
+    total = storage.count_books(**listing)
+    pages = max(1, -(-total // page_size))
+    with col2:
+        page = st.number_input(f"📖 Page (of {pages})", min_value=1, max_value=pages, step=1)
+    return page, page_size, total
+
+def page_caption(page, page_size, shown, total):
+    first = (page - 1) * page_size
+    st.caption(f"Showing {first + 1 if shown else 0}–{first + shown} of {total} books")
+
+st.subheader("📚 All Books in Library")
+
+if not storage.count():
+    st.info("📭 No books available.")
+else:
+    filter_genre = st.selectbox("📂 Filter by Genre", ["All"] + storage.genres())
+    filter_read = st.radio("✔️ Filter by Read Status", ["All", "Read", "Unread"])
+    sort_by = st.radio("🔽 Sort By", ["Title", "Author", "Year"])
+    view_format = st.radio("📅 View Format", ["Card View", "Table View"])
+
+    listing = dict(
+        genre=None if filter_genre == "All" else filter_genre,
+        read=None if filter_read == "All" else filter_read == "Read",
+        sort_by=sort_by.lower(),
+    )
+
+    # Display in Card Format, one page at a time
+    if view_format == "Card View":
+        with span("branch: Card View"):
+            page, page_size, total = page_picker(listing, CARD_PAGE_SIZES, default=1)
+            books = storage.list_page(**listing, page=page, page_size=page_size)
+            page_caption(page, page_size, len(books), total)
+
+            with span("render: cards"):
+                for book in books:
+                    with st.container():
+                        col1, col2 = st.columns([0.3, 0.7])
+                        with col1:
+                            # Show the cover thumbnail if there is one
+                            thumbnail = thumbnail_cache().get(book.get("cover"))
+                            if thumbnail:
+                                st.image(thumbnail, width=120)
+                        with col2:
+                            st.markdown(f"""
+                            <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+                                <h4 style="color: #2c3e50;">{book["title"]}</h4>
+                                <p style="color: #34495e; font-size: 16px;">{book["author"]}</p>
+                                <p style="color: #7f8c8d;">{book["year"]} | {book["genre"]}</p>
+                                <p style="color: #16a085;">{"✔️ Read" if book["read"] else "📖 Unread"}</p>
+                            </div>
+                            """, unsafe_allow_html=True)
+
+    # Display in Table Format, one page at a time: only the rows on the page get thumbnails
+    elif view_format == "Table View":
+        with span("branch: Table View"):
+            # Build the table column by column from the storage's listing
+            import pandas as pd
+            page, page_size, total = page_picker(listing, TABLE_PAGE_SIZES, default=0)
+            books = storage.frame(**listing, page=page, page_size=page_size)
+            page_caption(page, page_size, len(books), total)
+            with span("thumbnails: data URIs"):
+                covers = thumbnail_cache()
+                cover_uris = [covers.data_uri(cover) if cover else None for cover in books["cover"]]
+            with span("render: table"):
+                df = pd.DataFrame({
+                    "Cover": cover_uris,
+                    "Title": books["title"],
+                    "Author": books["author"],
+                    "Year": books["year"],
+                    "Genre": books["genre"],
+                    "Status": np.where(books["read"], "✔️ Read", "📖 Unread"),
+                })
+                st.dataframe(df, column_config={"Cover": st.column_config.ImageColumn("Cover")}, hide_index=True)
@@ -0,0 +1,5 @@
+# ✅ **Exit**
+import streamlit as st
+
+st.warning("🚪 Exiting the application...")
+st.stop()
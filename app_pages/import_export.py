@@ -0,0 +1,45 @@
+# ✅ **Import/Export Books**
+import streamlit as st
+import json
+from library_core import (
+    DUPLICATE_POLICIES, DUPLICATE_POLICY, EXPORT_FORMATS, export_bytes, import_books, import_chunks,
+    read_csv_chunks, read_excel_chunks, read_text_books, span,
+)
+
+st.subheader("📥 Import/Export Library")
+
+# Import and Export options
+export_format = st.selectbox("📤 Export Format", list(EXPORT_FORMATS))
+if export_format:
+    # The export is only generated when the button is clicked, and reused until the library changes
+    file_name, mime = EXPORT_FORMATS[export_format]
+    st.download_button(f"📤 Download {export_format}", lambda: export_bytes(export_format),
+                       file_name=file_name, mime=mime, on_click="ignore")
+
+uploaded_file = st.file_uploader("📥 Upload Library File", type=["csv", "xlsx", "json", "txt"])
+on_duplicate = st.radio("♻️ Books already in the library", list(DUPLICATE_POLICIES),
+                        index=list(DUPLICATE_POLICIES).index(DUPLICATE_POLICY), format_func=str.capitalize, horizontal=True)
+st.caption("JSON and text files are added to the library. CSV and Excel files replace it, "
+           "so for them this only applies to books repeated within the file.")
+duplicates_note = lambda count: f"{count} duplicates {DUPLICATE_POLICIES[on_duplicate]}"
+
+# Import each upload once, not again on every rerun while it sits in the uploader
+if uploaded_file is not None and st.session_state.get("imported_file_id") != uploaded_file.file_id:
+    st.session_state.imported_file_id = uploaded_file.file_id
+    with span(f"branch: import {uploaded_file.name.rsplit('.', 1)[-1]}"):
+        if uploaded_file.name.endswith(".csv"):
+            imported, skipped, duplicates = import_chunks(read_csv_chunks(uploaded_file), st.progress(0.0), on_duplicate)
+            st.success(f"📚 Library successfully imported from CSV! ({imported} books, {skipped} rows skipped, {duplicates_note(duplicates)})")
+
+        elif uploaded_file.name.endswith(".xlsx"):
+            imported, skipped, duplicates = import_chunks(read_excel_chunks(uploaded_file), st.progress(0.0), on_duplicate)
+            st.success(f"📚 Library successfully imported from Excel! ({imported} books, {skipped} rows skipped, {duplicates_note(duplicates)})")
+
+        elif uploaded_file.name.endswith(".json"):
+            library_data = json.load(uploaded_file)
+            duplicates = import_books(library_data, on_duplicate)
+            st.success(f"📚 Library successfully imported from JSON! ({duplicates_note(duplicates)})")
+
+        elif uploaded_file.name.endswith(".txt"):
+            duplicates = import_books(read_text_books(uploaded_file), on_duplicate)
+            st.success(f"📚 Library successfully imported from Text file! ({duplicates_note(duplicates)})")
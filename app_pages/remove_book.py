@@ -0,0 +1,32 @@
+# ✅ **Remove a Book**
+import streamlit as st
+from library_core import shared_storage, span
+
+storage = shared_storage()
+
+st.subheader("🗑️ Remove a Book")
+labels = storage.labels()
+book_ids = list(labels)
+
+# A widget may still hold the id of a book another session has removed since
+def book_label(book_id):
+    return labels.get(book_id, "(removed)")
+
+with span("render: book picker"):
+    book_to_remove = st.selectbox("🗂️ Select a book to remove", book_ids, format_func=book_label) if book_ids else None
+
+if book_to_remove is not None and st.button("🚮 Remove Book"):
+    book = storage.get(book_to_remove)
+    if book and storage.remove(book_to_remove):
+        st.success(f'🚮 Book "{book["title"]}" removed!')
+    labels = storage.labels()
+    book_ids = list(labels)
+
+# Bulk removal: every selected book goes in one batch and one write
+if book_ids:
+    with st.expander("🗑️ Remove several books"):
+        with span("render: book picker"):
+            books_to_remove = st.multiselect("🗂️ Select books to remove", book_ids, format_func=book_label)
+        if books_to_remove and st.button("🚮 Remove Selected Books"):
+            removed = storage.remove_many(books_to_remove)
+            st.success(f"🚮 {len(removed)} books removed!")
@@ -0,0 +1,35 @@
+# ✅ **Search for Books**
+import streamlit as st
+from library_core import find_covers, shared_storage, span
+
+storage = shared_storage()
+
+st.subheader("🔍 Search for a Book")
+search_criteria = st.radio("🔎 Search by:", ["Title", "Author", "Year", "Genre", "Read/Unread", "Best Match", "Cover Image"])
+
+query = st.text_input(f"Enter {search_criteria} to search") if search_criteria not in ("Read/Unread", "Cover Image") else None
+if search_criteria == "Read/Unread":
+    read_status = st.radio("✔️ Choose status:", ["Read", "Unread"])
+elif search_criteria == "Best Match":
+    st.caption("Ranked search over title and author that tolerates typos (at least 3 characters).")
+elif search_criteria == "Cover Image":
+    cover_query = st.file_uploader("🖼️ Upload a book cover image to search", type=["png", "jpg", "jpeg"])
+
+if st.button("🔎 Search"):
+    with span(f"branch: {search_criteria}"):
+        if search_criteria == "Cover Image":
+            results = find_covers(cover_query) if cover_query else []
+        elif search_criteria == "Best Match":
+            results = storage.fuzzy_search(query)
+        elif search_criteria == "Read/Unread":
+            results = [(book, None) for book in storage.by_read(read_status == "Read")]
+        else:
+            results = [(book, None) for book in storage.search(search_criteria.lower(), query)]
+
+    with span("render: results"):
+        if results:
+            for book, score in results:
+                match = f" - 🎯 {score:.0%} match" if score is not None else ""
+                st.write(f'📘 **{book["title"]}** - {book["author"]} ({book["year"]}) - {book["genre"]} - {"✔️ Read" if book["read"] else "📖 Unread"}{match}')
+        else:
+            st.warning("❌ No books found.")
@@ -0,0 +1,64 @@
+# ✅ **Library Statistics (Card Format)**
+import streamlit as st
+from library_core import shared_storage, span
+
+storage = shared_storage()
+
+st.subheader("📊 Library Statistics")
+
+# Calculate Statistics
+stats = storage.stats()
+total_books = stats["total"]
+read_books = stats["read"]
+unread_books = stats["unread"]
+
+most_common_genre = stats["top_genre"]
+most_read_author = stats["top_author"]
+
+with span("render: cards"):
+    with st.container():
+        st.markdown(f"""
+        <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+            <h4 style="color: #2c3e50;">✔️ Books Read</h4>
+            <p style="color: #16a085; font-size: 24px; font-weight: bold;">{read_books} ({(read_books/total_books*100) if total_books > 0 else 0:.2f}%)</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with st.container():
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"""
+            <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+                <h4 style="color: #2c3e50;">📖 Books Unread</h4>
+                <p style="color: #e74c3c; font-size: 24px; font-weight: bold;">{unread_books}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            st.markdown(f"""
+            <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+                <h4 style="color: #2c3e50;">🎬 Most Common Genre</h4>
+                <p style="color: #34495e; font-size: 20px;">{most_common_genre}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    with st.container():
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown(f"""
+            <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+                <h4 style="color: #2c3e50;">🌟 Most Read Author</h4>
+                <p style="color: #34495e; font-size: 20px;">{most_read_author}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            top_genres = "<br>".join(f"{genre} ({count})" for genre, count in stats["top_genres"]) or "N/A"
+            st.markdown(f"""
+            <div style="background-color: #f0f0f0; border-radius: 10px; padding: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1); margin-bottom: 20px;">
+                <h4 style="color: #2c3e50;">🏆 Top Genres</h4>
+                <p style="color: #34495e; font-size: 16px;">{top_genres}</p>
+            </div>
+            """, unsafe_allow_html=True)
@@ -0,0 +1,169 @@
+# Concurrent-session load test for the app, built on Streamlit's AppTest.
+#
+# N sessions run side by side in one process, as they do on a Streamlit server, sharing the
+# cached storage and indexes. Each one clicks through Add Book, Search Book, Display Books
+# (card and table view), Statistics and Import/Export (a download in one of the export
+# formats and a small JSON or text upload) against a seeded library.json, and every script
+# rerun is timed:
+#
+#     python benchmarks/load.py --sessions 16 --rounds 5 --books 10000
+#
+# AppTest swaps a process-wide mock runtime in and out around each run, so two runs cannot
+# overlap; the sessions' runs queue on a lock instead. Latency is measured from the click,
+# including the time spent queued behind other sessions (as on a busy server), and service
+# time is the run alone. A download is not a script run: the server calls the function the
+# download button defers to (export_bytes) when the browser fetches the file, so the sessions
+# call it directly, outside the lock, alongside the other sessions' runs. The report gives
+# p50/p95/p99 latency per page, the median service time and the process' peak RSS.
+import argparse
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from synthetic import write_library, WORDS
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import library_core as core  # noqa: E402
+
+TIMEOUT = 300
+# Books in each session's upload per round
+UPLOAD_BOOKS = 20
+RUN_LOCK = threading.Lock()
+
+
+# One simulated user: a sequence of page visits, timing each rerun under the page's label
+class Session:
+    def __init__(self, app, number, latencies, service, lock):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(app, default_timeout=TIMEOUT)
+        self.number = number
+        self.latencies = latencies
+        self.service = service
+        self.lock = lock
+        self.random = random.Random(number)
+        self.errors = 0
+
+    def timed(self, label, action, lock=RUN_LOCK):
+        start = time.perf_counter()
+        with lock:
+            started = time.perf_counter()
+            action()
+        end = time.perf_counter()
+        with self.lock:
+            self.latencies[label].append(end - start)
+            self.service[label].append(end - started)
+        if self.at.exception:
+            self.errors += 1
+
+    def visit(self, page):
+        self.at.switch_page(page)
+        self.timed(page, self.at.run)
+
+    def round(self, index):
+        at = self.at
+        self.visit("app_pages/add_book.py")
+        at.text_input[0].set_value(f"Load Test {self.number}-{index}")
+        at.text_input[1].set_value(f"Session {self.number}")
+        at.text_input[2].set_value("Load Test")
+        self.timed("Add Book: submit", at.button[0].click().run)
+
+        self.visit("app_pages/search_book.py")
+        at.text_input[0].set_value(self.random.choice(WORDS))
+        self.timed("Search Book: search", at.button[0].click().run)
+
+        self.visit("app_pages/display_books.py")
+        next(radio for radio in at.radio if radio.label == "📅 View Format").set_value("Table View")
+        self.timed("Display Books: table", at.run)
+        next(radio for radio in at.radio if radio.label == "📅 View Format").set_value("Card View")
+        self.timed("Display Books: cards", at.run)
+
+        self.visit("app_pages/statistics.py")
+        self.visit("app_pages/import_export.py")
+        export_format = list(core.EXPORT_FORMATS)[(self.number + index) % len(core.EXPORT_FORMATS)]
+        at.selectbox[0].set_value(export_format)
+        self.timed(f"Import/Export: {export_format} selected", at.run)
+        self.timed(f"Import/Export: {export_format} download", lambda: core.export_bytes(export_format),
+                   lock=contextlib.nullcontext())
+        name, data, mime = self.upload(index)
+        self.timed(f"Import/Export: {name.rsplit('.', 1)[1]} upload", at.file_uploader[0].upload(name, data, mime).run)
+
+    # A small file of new books, JSON or text in turn (both add to the library; a CSV or Excel
+    # upload would replace it)
+    def upload(self, index):
+        books = [{"title": f"Upload {self.number}-{index}-{i} {self.random.choice(WORDS).title()}",
+                  "author": f"Session {self.number}", "year": 2000 + i, "genre": "Load Test"}
+                 for i in range(UPLOAD_BOOKS)]
+        if index % 2:
+            lines = "\n".join(f"{book['title']} - {book['author']} - {book['year']} - {book['genre']}" for book in books)
+            return "upload.txt", lines.encode(), "text/plain"
+        return "upload.json", json.dumps(books).encode(), "application/json"
+
+    def run(self, rounds):
+        self.timed("first run", self.at.run)
+        for index in range(rounds):
+            self.round(index)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run concurrent AppTest sessions against a seeded library.")
+    parser.add_argument("--app", default=os.path.join(os.path.dirname(__file__), "..", "App.py"))
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3, help="trips through the pages per session")
+    parser.add_argument("--books", type=int, default=10000, help="size of the seeded library")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+    os.environ["LIBRARY_BACKEND"] = args.backend
+
+    latencies = defaultdict(list)
+    service = defaultdict(list)
+    lock = threading.Lock()
+    with tempfile.TemporaryDirectory() as directory:
+        write_library(directory, args.books)
+        os.chdir(directory)
+        rss_before = peak_rss_mb()
+        sessions = [Session(app, number, latencies, service, lock) for number in range(args.sessions)]
+        threads = [threading.Thread(target=session.run, args=(args.rounds,)) for session in sessions]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+    pages = {label: {"runs": len(times),
+                     **{f"p{q}_ms": round(float(np.percentile(times, q)) * 1000, 1) for q in (50, 95, 99)},
+                     "service_p50_ms": round(float(np.percentile(service[label], 50)) * 1000, 1)}
+             for label, times in latencies.items()}
+    report = {"sessions": args.sessions, "rounds": args.rounds, "books": args.books, "backend": args.backend,
+              "wall_s": round(wall, 2), "errors": sum(session.errors for session in sessions),
+              "peak_rss_mb": round(peak_rss_mb(), 1), "peak_rss_before_mb": round(rss_before, 1), "pages": pages}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{args.sessions} sessions x {args.rounds} rounds, {args.books} books ({args.backend}): "
+          f"{report['wall_s']}s, {report['errors']} errors, peak RSS {report['peak_rss_mb']} MB "
+          f"({report['peak_rss_before_mb']} MB before the sessions)")
+    print(f"  {'page':<28} {'runs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'service p50':>12}")
+    for label, stats in pages.items():
+        print(f"  {label:<28} {stats['runs']:>5} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9} "
+              f"{stats['service_p50_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
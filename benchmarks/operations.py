@@ -0,0 +1,213 @@
+# Benchmarks for the core library operations at several catalogue sizes.
+#
+# Each size gets a synthetic library (see synthetic.py) in a scratch directory, and every
+# operation is timed there through library_core, the same code the pages call:
+#
+#     python benchmarks/operations.py --sizes 1000,10000 --output results.json
+#     python benchmarks/operations.py --baseline results.json   # exits 1 on a regression
+#     python benchmarks/operations.py --snapshot binary --only save_library,load_library
+#
+# Results are JSON: one entry per (operation, books, backend) with the median and best time.
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from synthetic import generate_books, ZIPF_EXPONENT
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import library_core as core  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+# Excel files are slow to write and read at any size; they stop at this many books by default
+EXCEL_LIMIT = 100000
+
+
+# Stands in for a Streamlit UploadedFile
+class Upload(io.BytesIO):
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            super().__init__(file.read())
+        self.name = os.path.basename(path)
+        self.size = len(self.getbuffer())
+
+
+class NoProgress:
+    def progress(self, fraction, text=None):
+        pass
+
+
+def measure(func, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# (name, function, setup) for every operation at one size; storage is the open catalogue
+def operations(storage, library, books, excel):
+    query_word = books[len(books) // 2]["title"].split()[0].lower()
+    typo = query_word[:2] + query_word[3:] if len(query_word) > 4 else query_word + "x"
+    top_genre = storage.stats()["top_genre"]
+
+    def uncached():
+        # Drop memoized listings and fuzzy results, so each run does the work again
+        for name in ("listings", "fuzzy_results"):
+            if hasattr(storage, name):
+                setattr(storage, name, {})
+
+    def empty():
+        storage.replace([])
+
+    def full():
+        storage.replace(library)
+
+    with open("import.txt", "w", encoding="utf-8") as file:
+        file.writelines(f"{book['title']} - {book['author']} - {book['year']} - {book['genre']}\n" for book in books)
+
+    ops = [
+        ("save_library", lambda: core.save_library(library), None),
+        ("load_library", core.load_library, None),
+        ("search_title", lambda: storage.search("title", query_word), None),
+        ("search_author", lambda: storage.search("author", "rehman"), None),
+        ("fuzzy_search", lambda: storage.fuzzy_search(typo), uncached),
+        ("display_filter_sort", lambda: storage.list_page(genre=top_genre, read=False, sort_by="year"), uncached),
+        ("display_table", lambda: storage.frame(), uncached),
+        ("statistics", lambda: core.LibraryStats(library).snapshot(), None),
+        ("statistics_incremental", storage.stats, None),
+    ]
+    # Exports go to their own directory: the JSON export is named like the library file
+    os.makedirs("exports", exist_ok=True)
+    export_path = lambda export_format: os.path.join("exports", core.EXPORT_FORMATS[export_format][0])
+    for export_format in core.EXPORT_FORMATS:
+        if export_format == "Excel" and not excel:
+            continue
+        ops.append((f"export_{export_format.lower()}",
+                    lambda export_format=export_format: core.write_export(export_format, library, export_path(export_format)),
+                    None))
+
+    # The imports read their own copies of the exports, written on first use (untimed), so
+    # they run with or without the export operations
+    def fixture(export_format):
+        path = os.path.join("imports", core.EXPORT_FORMATS[export_format][0])
+        if not os.path.exists(path):
+            os.makedirs("imports", exist_ok=True)
+            core.write_export(export_format, library, path)
+        return path
+
+    def import_chunks(read_chunks, export_format):
+        return lambda: core.import_chunks(read_chunks(Upload(fixture(export_format))), NoProgress(), storage=storage)
+
+    ops += [
+        ("import_csv", import_chunks(core.read_csv_chunks, "CSV"), lambda: fixture("CSV")),
+        ("import_json", lambda: storage.add_many(json.load(Upload(fixture("JSON")))), lambda: (fixture("JSON"), empty())),
+        ("import_text", lambda: storage.add_many(core.read_text_books(Upload("import.txt"))), empty),
+    ]
+    if excel:
+        ops.append(("import_excel", import_chunks(core.read_excel_chunks, "Excel"), lambda: fixture("Excel")))
+    # Leave the catalogue whole for whatever runs after the imports
+    ops.append(("reset", full, None))
+    return ops
+
+
+def run_size(n, backend, repeat, excel_limit, only):
+    results = []
+    books = generate_books(n)
+    library = [core.Book.from_dict(book) for book in books]
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            core.journal_state.clear()
+            core.save_library(library)
+            core.STORAGE_BACKEND = backend
+            start = time.perf_counter()
+            storage = core.open_storage()
+            results.append(result("open_storage", n, backend, [time.perf_counter() - start]))
+            for name, func, setup in operations(storage, library, books, excel=n <= excel_limit):
+                if name == "reset":
+                    func()
+                elif only is None or name in only:
+                    results.append(result(name, n, backend, measure(func, repeat, setup)))
+                    print(f"  {name:<24} {results[-1]['median_s'] * 1000:>10.2f} ms", file=sys.stderr)
+            # A journal compaction may still be running in the background
+            while core.journal_state()["compacting"]:
+                time.sleep(0.01)
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def result(name, n, backend, times):
+    return {"operation": name, "books": n, "backend": backend, "median_s": statistics.median(times),
+            "min_s": min(times), "runs": len(times)}
+
+
+# Print each result next to its baseline; returns the results that got slower than the threshold
+def compare(results, baseline, threshold, noise_floor=0.001):
+    previous = {(entry["operation"], entry["books"], entry["backend"]): entry for entry in baseline["results"]}
+    regressions = []
+    print(f"{'operation':<24} {'books':>9} {'baseline ms':>12} {'now ms':>10} {'ratio':>7}")
+    for entry in results:
+        before = previous.get((entry["operation"], entry["books"], entry["backend"]))
+        if before is None:
+            continue
+        ratio = entry["median_s"] / before["median_s"] if before["median_s"] else float("inf")
+        slower = ratio > 1 + threshold and entry["median_s"] - before["median_s"] > noise_floor
+        if slower:
+            regressions.append(entry)
+        print(f"{entry['operation']:<24} {entry['books']:>9} {before['median_s'] * 1000:>12.2f} "
+              f"{entry['median_s'] * 1000:>10.2f} {ratio:>6.2f}x{'  REGRESSION' if slower else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the core library operations at several catalogue sizes.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated book counts")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--snapshot", choices=["json", "binary", "both"], default=core.SNAPSHOT_FORMAT,
+                        help="library files save_library writes and load_library reads")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation (1 at a million books and up)")
+    parser.add_argument("--only", help="comma-separated operations to run")
+    parser.add_argument("--excel-limit", type=int, default=EXCEL_LIMIT)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    only = set(args.only.split(",")) if args.only else None
+    core.SNAPSHOT_FORMAT = args.snapshot
+    results = []
+    for n in map(int, args.sizes.split(",")):
+        print(f"{n} books ({args.backend})", file=sys.stderr)
+        results += run_size(n, args.backend, args.repeat if n < 1000000 else 1, args.excel_limit, only)
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+                 "zipf_exponent": ZIPF_EXPONENT, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}", file=sys.stderr)
+            sys.exit(1)
+    elif not args.output:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
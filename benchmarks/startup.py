@@ -0,0 +1,91 @@
+# Cold-start benchmark for App.py.
+#
+# Every page is opened in a fresh interpreter, so nothing is cached in sys.modules, and the
+# script run that opens it is timed along with the heavy modules it had to import:
+#
+#     python benchmarks/startup.py                    # the App.py next to this folder
+#     python benchmarks/startup.py --app old_App.py   # e.g. git show HEAD~1:App.py > old_App.py
+#
+# Pages are opened by their files under app_pages/; for a single-file App.py from before the
+# split only the cold start row applies.
+#
+# Each child runs in a scratch directory seeded with a synthetic library of --books books, so
+# the real library.json is never touched.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from synthetic import write_library
+
+HEAVY_MODULES = ["pandas", "pyarrow", "PIL.Image", "pytz"]
+
+# Page label and the steps that open it after the first (Add Book) run: switching to a page
+# file, or setting a radio button by its label
+PAGES = {
+    "Add Book (cold start)": [],
+    "Remove Book": [("page", "app_pages/remove_book.py")],
+    "Search Book": [("page", "app_pages/search_book.py")],
+    "Display Books: Card View": [("page", "app_pages/display_books.py")],
+    "Display Books: Table View": [("page", "app_pages/display_books.py"), ("📅 View Format", "Table View")],
+    "Statistics": [("page", "app_pages/statistics.py")],
+    "Import/Export": [("page", "app_pages/import_export.py")],
+}
+
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+app, steps, modules = sys.argv[1], json.loads(sys.argv[2]), json.loads(sys.argv[3])
+at = AppTest.from_file(app, default_timeout=300)
+start = time.perf_counter()
+at.run()
+for label, value in steps:
+    if label == "page":
+        at.switch_page(value)
+    else:
+        next(radio for radio in at.radio if radio.label == label).set_value(value)
+    start = time.perf_counter()
+    at.run()
+elapsed = time.perf_counter() - start
+assert not at.exception, at.exception
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in modules if name in sys.modules]}))
+"""
+
+
+def run_page(app, steps, books):
+    with tempfile.TemporaryDirectory() as directory:
+        write_library(directory, books)
+        result = subprocess.run([sys.executable, "-c", CHILD, app, json.dumps(steps), json.dumps(HEAVY_MODULES)],
+                                cwd=directory, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the first run of each page of the app in a fresh interpreter.")
+    parser.add_argument("--app", default=os.path.join(os.path.dirname(__file__), "..", "App.py"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+    app = os.path.abspath(args.app)
+
+    results = {}
+    for page, steps in PAGES.items():
+        runs = [run_page(app, steps, args.books) for _ in range(args.runs)]
+        results[page] = {"median_ms": round(statistics.median(run["seconds"] for run in runs) * 1000, 1),
+                         "loaded": runs[-1]["loaded"]}
+
+    if args.json:
+        print(json.dumps({"app": app, "books": args.books, "runs": args.runs, "pages": results}, indent=2))
+        return
+    print(f"{app} ({args.books} books, median of {args.runs} runs)")
+    for page, result in results.items():
+        print(f"  {page:<28} {result['median_ms']:>8.1f} ms   heavy imports: {', '.join(result['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Synthetic libraries for the benchmarks. Authors, genres and title words are drawn from Zipf
+# distributions, so a few of each are very common and the rest form a long tail, the way they
+# do in a real catalogue; years and read flags are uniform.
+import json
+import os
+
+import numpy as np
+
+ZIPF_EXPONENT = 1.1
+
+GENRES = [
+    "Fiction", "Mystery", "Fantasy", "Science Fiction", "Romance", "Thriller", "Biography", "History",
+    "Poetry", "Classic", "Horror", "Self-Help", "Philosophy", "Travel", "Cooking", "Art", "Science",
+    "Religion", "Children", "Young Adult", "Graphic Novel", "Drama", "Humor", "Politics", "Economics",
+    "Psychology", "Sports", "Music", "Essays", "Short Stories",
+]
+FIRST_NAMES = [
+    "Abdul", "Ayesha", "Bilal", "Fatima", "Hamza", "Zainab", "Omar", "Sara", "Ali", "Hina", "John", "Mary",
+    "James", "Anna", "Peter", "Olga", "Lucas", "Mei", "Ravi", "Elena", "Kofi", "Yuki", "Carlos", "Ingrid",
+]
+LAST_NAMES = [
+    "Rehman", "Khan", "Ahmed", "Siddiqui", "Smith", "Tolkien", "Austen", "Orwell", "Kafka", "Rowling",
+    "Garcia", "Tanaka", "Okafor", "Ivanova", "Nguyen", "Muller", "Rossi", "Dubois", "Silva", "Kowalski",
+]
+SYLLABLES = ["ka", "lo", "mi", "ra", "the", "shadow", "sun", "ri", "ver", "sto", "ne", "win", "ter", "gar",
+             "den", "dra", "gon", "la", "fire", "moon", "sea", "star", "night", "wood", "land", "heart",
+             "light", "song", "city", "king"]
+WORDS = [first + second for first in SYLLABLES for second in SYLLABLES]
+
+
+# Indexes 0..count-1 drawn with probability proportional to 1 / rank ** exponent
+def zipf_choice(rng, count, size, exponent=ZIPF_EXPONENT):
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return rng.choice(count, size=size, p=weights / weights.sum())
+
+
+# n books as library.json dicts, with ids 1..n; the same seed gives the same library
+def generate_books(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # One author per 20 books; past the first/last name pairs, names get a numeric suffix
+    pairs = [f"{first} {last}" for last in LAST_NAMES for first in FIRST_NAMES]
+    authors = [pairs[i % len(pairs)] + (f" {i // len(pairs)}" if i >= len(pairs) else "")
+               for i in range(max(len(pairs), n // 20))]
+    author_picks = zipf_choice(rng, len(authors), n)
+    genre_picks = zipf_choice(rng, len(GENRES), n)
+    word_picks = zipf_choice(rng, len(WORDS), (n, 4))
+    title_lengths = rng.integers(1, 5, n)
+    years = rng.integers(1800, 2025, n)
+    read = rng.random(n) < 0.4
+    return [{
+        "id": i + 1,
+        "title": " ".join(WORDS[word] for word in word_picks[i, :title_lengths[i]]).title(),
+        "author": authors[author_picks[i]],
+        "year": int(years[i]),
+        "genre": GENRES[genre_picks[i]],
+        "read": bool(read[i]),
+        "cover": "",
+    } for i in range(n)]
+
+
+# Write a synthetic library.json of n books into directory
+def write_library(directory, n, seed=0):
+    with open(os.path.join(directory, "library.json"), "w") as file:
+        json.dump(generate_books(n, seed), file)
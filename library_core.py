@@ -0,0 +1,2489 @@
+# Shared core of the Personal Library Manager: the book records, storage backends, search,
+# duplicate and cover indexes, statistics, thumbnails and import/export. Pages import it once
+# per server process; the shared objects themselves live in st.cache_resource.
+import streamlit as st
+import json
+import os
+import numpy as np
+import threading
+import sqlite3
+import sys
+import hashlib
+import base64
+import heapq
+import csv
+import tempfile
+import textwrap
+import itertools
+import time
+import contextlib
+import functools
+import bisect
+import struct
+import gc
+from collections import defaultdict, deque, OrderedDict, Counter
+# pandas and PIL are imported where they are used: most pages never need them, and pandas
+# alone takes longer to import than Streamlit
+
+# A setting from the environment that must be one of choices: a typo stops the app at startup
+# instead of quietly doing something else
+def env_choice(name, default, choices):
+    value = os.environ.get(name, default)
+    if value not in choices:
+        raise ValueError(f"{name}={value!r} is not one of: {', '.join(choices)}")
+    return value
+
+# A TCP port from the environment, or None when it is set to "off"
+def env_port(name, default):
+    value = os.environ.get(name, default)
+    if value == "off":
+        return None
+    if not value.isdigit() or not 0 <= int(value) <= 65535:
+        raise ValueError(f"{name}={value!r} is not a port number (0-65535) or 'off'")
+    return int(value)
+
+LIBRARY_FILE = "library.json"
+SNAPSHOT_FILE = "library.snapshot"
+JOURNAL_FILE = "library.journal"
+SQLITE_FILE = "library.db"
+
+COVERS_DIR = "covers"
+THUMBS_DIR = os.path.join(COVERS_DIR, "thumbs")
+
+# Covers are shown as thumbnails of at most THUMB_SIZE pixels, stored as WebP
+THUMB_SIZE = (240, 360)
+THUMB_QUALITY = 80
+# Byte budgets for the thumbnail cache on disk and in memory
+THUMB_DISK_LIMIT = 256 * 1024 * 1024
+THUMB_MEMORY_LIMIT = 32 * 1024 * 1024
+
+# Perceptual hashes of the covers, one JSON line per hashed cover (later lines win)
+COVER_HASHES_FILE = os.path.join(COVERS_DIR, "hashes.jsonl")
+# Covers whose 64-bit hashes differ in at most this many bits count as the same cover
+COVER_MATCH_DISTANCE = 10
+
+EXPORTS_DIR = "exports"
+EXPORT_FIELDS = ["id", "title", "author", "year", "genre", "read", "cover"]
+EXPORT_FORMATS = {
+    "CSV": ("library.csv", "text/csv"),
+    "Excel": ("library.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "JSON": ("library.json", "application/json"),
+    "Text": ("library.txt", "text/plain"),
+}
+
+# Rows parsed at a time when importing CSV/Excel files
+IMPORT_CHUNK_ROWS = 10000
+
+# What adding a book that is already in the library (same title, author and year) does:
+# "skip" keeps the library's copy, "merge" fills in its empty fields, "replace" overwrites it
+DUPLICATE_POLICIES = {"skip": "skipped", "merge": "merged", "replace": "replaced"}
+DUPLICATE_POLICY = env_choice("LIBRARY_DUPLICATES", "skip", DUPLICATE_POLICIES)
+
+# Page sizes offered by the Card View and the Table View in Display Books (every row of a
+# table page carries its cover thumbnail inline)
+CARD_PAGE_SIZES = [10, 25, 50, 100]
+TABLE_PAGE_SIZES = [100, 250, 500, 1000]
+
+# Fuzzy search: results shown, lowest score kept (share of the query's trigrams matched),
+# candidates ranked per query and trigram postings scanned per query (the latency budget)
+FUZZY_RESULTS = 20
+FUZZY_MIN_SCORE = 0.3
+FUZZY_CANDIDATES = 500
+FUZZY_POSTINGS_BUDGET = 50000
+# Memoized fuzzy queries kept per library version
+FUZZY_CACHE_SIZE = 256
+
+# "json" keeps the library in LIBRARY_FILE, "sqlite" keeps it in SQLITE_FILE
+STORAGE_BACKEND = env_choice("LIBRARY_BACKEND", "json", ("json", "sqlite"))
+
+# "journal" appends every change to JOURNAL_FILE, "json" rewrites the snapshot each time
+STORAGE_MODE = env_choice("LIBRARY_STORAGE_MODE", "journal", ("journal", "json"))
+# Snapshot formats written: "binary" (the columnar SNAPSHOT_FILE, many times faster to load
+# and to write), "json" (LIBRARY_FILE) or "both", which keeps library.json current for other
+# tools at the cost of an indented JSON dump on every save and compaction, 15-20x slower than
+# the binary write. The file of the format written (the binary one with "both") is the one
+# loaded; the other is only read when that one does not exist yet, to migrate a library
+# saved under another format, and is renamed to <name>.migrated by the first save after.
+SNAPSHOT_FORMAT = env_choice("LIBRARY_SNAPSHOT", "binary", ("binary", "json", "both"))
+SNAPSHOT_MAGIC = b"LIBSNAP\n"
+SNAPSHOT_VERSION = 1
+# Fold the journal back into the snapshot once it holds this many records
+JOURNAL_COMPACT_EVERY = 1000
+# How journal appends reach the disk: "group" fsyncs once for all the appends made within
+# JOURNAL_SYNC_WINDOW seconds of each other, "always" fsyncs every append, "off" leaves
+# flushing to the OS. Snapshots are always written to a temp file and renamed into place.
+JOURNAL_SYNC = env_choice("LIBRARY_SYNC", "group", ("group", "always", "off"))
+JOURNAL_SYNC_WINDOW = 0.01
+
+# Per-rerun instrumentation: every script run records timing spans for its page branches and
+# its storage, index and render steps. The last PERF_HISTORY runs are kept per server process
+# and shown in a sidebar panel that only appears once a session opens the app with ?perf in
+# the URL; ?perf=cpu also captures its runs with cProfile, ?perf=memory with tracemalloc,
+# ?perf=all with both.
+PERF_PARAM = "perf"
+PERF_CAPTURES = {"cpu": ("cpu",), "memory": ("memory",), "all": ("cpu", "memory")}
+PERF_HISTORY = 50
+# Functions (cProfile) or allocation sites (tracemalloc) kept from a capture
+PERF_TOP = 30
+
+# Prometheus metrics, served as text at http://METRICS_ADDRESS:METRICS_PORT/metrics by a thread
+# of the Streamlit server process. LIBRARY_METRICS_PORT=off turns the endpoint off.
+METRICS_ADDRESS = os.environ.get("LIBRARY_METRICS_ADDRESS", "127.0.0.1")
+METRICS_PORT = env_port("LIBRARY_METRICS_PORT", "9464")
+# Streamlit versions (major, minor) whose private session manager active_sessions reads
+SESSION_COUNT_VERSIONS = ((1, 18), (1, 65))
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8, 10 ** 9)
+# Name: (type, help, histogram buckets)
+METRICS = {
+    "library_storage_seconds": ("histogram", "Storage call latency by operation and kind (read or write).", LATENCY_BUCKETS),
+    "library_search_seconds": ("histogram", "Search latency by type (substring, read status, fuzzy or cover).", LATENCY_BUCKETS),
+    "library_save_seconds": ("histogram", "Time to write a full library snapshot (save_library).", LATENCY_BUCKETS),
+    "library_save_bytes": ("histogram", "Bytes written per library snapshot (save_library).", SIZE_BUCKETS),
+    "library_journal_bytes_total": ("counter", "Bytes appended to the change journal.", None),
+    "library_import_rows_total": ("counter", "Rows read by imports.", None),
+    "library_import_seconds_total": ("counter", "Time spent importing.", None),
+    "library_import_rows_per_second": ("gauge", "Throughput of the last import.", None),
+    "library_thumbnail_requests_total": ("counter", "Cover thumbnail lookups by result (memory, disk or miss).", None),
+    "library_thumbnail_hit_ratio": ("gauge", "Share of cover thumbnail lookups served from the memory or disk cache.", None),
+    "library_active_sessions": ("gauge", "Browser sessions connected to the server.", None),
+    "library_books": ("gauge", "Books in the catalogue.", None),
+}
+# Storage operations that change the library, and those that are searches (with their type)
+STORAGE_WRITES = {"add", "add_many", "remove", "remove_many", "replace", "replace_chunks"}
+STORAGE_SEARCHES = {"search": "substring", "by_read": "read status", "fuzzy_search": "fuzzy"}
+
+
+# One script run: its spans as (name, depth, start offset, seconds), in the order they began
+class Rerun:
+    def __init__(self, number, capture):
+        self.number = number
+        self.page = None
+        self.capture = capture
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.spans = []
+        self.depth = 0
+        self.profile = None
+        self.memory = None
+
+    def to_dict(self):
+        return {
+            "number": self.number,
+            "page": self.page,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "ms": round(self.seconds * 1000, 3),
+            "capture": list(self.capture),
+            "spans": [{"name": name, "depth": depth, "start_ms": round(offset * 1000, 3), "ms": round(seconds * 1000, 3)}
+                      for name, depth, offset, seconds in self.spans if seconds is not None],
+            "profile": self.profile,
+            "memory": self.memory,
+        }
+
+# The run of the current script thread; background threads have none
+perf_local = threading.local()
+
+# Recent runs, and the lock a cProfile/tracemalloc capture holds: both profilers see the
+# whole process, so one session captures at a time
+@st.cache_resource
+def perf_state():
+    return {"lock": threading.Lock(), "reruns": deque(maxlen=PERF_HISTORY), "numbers": itertools.count(1),
+            "capture": threading.Lock()}
+
+# Time the block as a span of the current script run (a no-op outside one). Spans opened
+# inside it become its children.
+@contextlib.contextmanager
+def span(name):
+    rerun = getattr(perf_local, "rerun", None)
+    if rerun is None:
+        yield
+        return
+    index = len(rerun.spans)
+    rerun.spans.append((name, rerun.depth, time.perf_counter() - rerun.start, None))
+    rerun.depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rerun.depth -= 1
+        rerun.spans[index] = rerun.spans[index][:3] + (time.perf_counter() - start,)
+
+# span as a decorator, for storage, index and journal functions. With a histogram, every
+# call is also observed in that metric, inside a script run or not.
+def timed(name, histogram=None, **labels):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if histogram is not None:
+                start = time.perf_counter()
+                try:
+                    with span(name):
+                        return func(*args, **kwargs)
+                finally:
+                    metrics_registry.observe(histogram, time.perf_counter() - start, **labels)
+            if getattr(perf_local, "rerun", None) is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# timed for storage methods: a span, the storage latency histogram and, for searches, the
+# search latency histogram
+def storage_timed(operation):
+    kind = "write" if operation in STORAGE_WRITES else "read"
+    search = STORAGE_SEARCHES.get(operation)
+    def decorate(func):
+        traced = timed(f"storage: {operation}", "library_storage_seconds", operation=operation, kind=kind)(func)
+        if search is None:
+            return traced
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return traced(*args, **kwargs)
+            finally:
+                metrics_registry.observe("library_search_seconds", time.perf_counter() - start, type=search)
+        return wrapper
+    return decorate
+
+# Counters, gauges and histograms by label set, plus collectors: functions read at scrape time
+# for values the app keeps anyway (the catalogue size, the thumbnail cache's hit counts).
+# A collector returns a number, a {labels: number} dict, or None to leave the metric out.
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = defaultdict(dict)
+        self.collectors = {}
+
+    @staticmethod
+    def key(labels):
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self.key(labels)
+        with self.lock:
+            self.series[name][key] = self.series[name].get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.series[name][self.key(labels)] = value
+
+    # Histograms keep a count per bucket (the last one is +Inf) and the sum of the values
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = self.key(labels)
+        with self.lock:
+            counts = self.series[name].get(key)
+            if counts is None:
+                counts = self.series[name][key] = [0] * (len(buckets) + 2)
+            counts[bisect.bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+    def collect(self, name, func):
+        self.collectors[name] = func
+
+    # All the metrics in the Prometheus text exposition format
+    def render(self):
+        with self.lock:
+            series = {name: {key: list(value) if isinstance(value, list) else value for key, value in values.items()}
+                      for name, values in self.series.items()}
+        for name, func in list(self.collectors.items()):
+            value = func()
+            if value is not None:
+                series[name] = value if isinstance(value, dict) else {(): value}
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            if not series.get(name):
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for key, value in sorted(series[name].items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{metric_labels(key)} {float(value)!r}")
+                    continue
+                total = 0
+                for bound, count in zip(buckets + ("+Inf",), value):
+                    total += count
+                    lines.append(f"{name}_bucket{metric_labels(key + (('le', str(bound)),))} {total}")
+                lines.append(f"{name}_sum{metric_labels(key)} {float(value[-1])!r}")
+                lines.append(f"{name}_count{metric_labels(key)} {total}")
+        return "\n".join(lines) + "\n"
+
+# {name="value",...} for a label key, with the value escaped the Prometheus way
+def metric_labels(key):
+    if not key:
+        return ""
+    escape = lambda value: str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in key) + "}"
+
+# The process' registry. A module global like perf_local rather than st.cache_resource:
+# it is read on every storage call, where a cached-resource lookup costs several times more
+# than the observation itself.
+metrics_registry = Metrics()
+
+# Record the script run in the block and keep it in the history. The ?perf query parameter
+# is remembered in the session, so it survives switching pages.
+@contextlib.contextmanager
+def profiled_rerun():
+    if PERF_PARAM in st.query_params:
+        st.session_state[PERF_PARAM] = st.query_params[PERF_PARAM]
+    capture = PERF_CAPTURES.get(st.session_state.get(PERF_PARAM), ())
+    state = perf_state()
+    if capture and not state["capture"].acquire(blocking=False):
+        capture = ()  # Another session's run is being captured
+    rerun = perf_local.rerun = Rerun(next(state["numbers"]), capture)
+    profiler = memory_before = None
+    if "memory" in capture:
+        import tracemalloc
+        # Already tracing (PYTHONTRACEMALLOC): report what this run added instead
+        memory_before = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if memory_before is None:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    if "cpu" in capture:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield rerun
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        rerun.seconds = time.perf_counter() - rerun.start
+        perf_local.rerun = None
+        try:
+            if "memory" in capture:
+                rerun.memory = memory_report(memory_before)
+            if profiler is not None:
+                rerun.profile = profile_report(profiler)
+        finally:
+            if capture:
+                state["capture"].release()
+        with state["lock"]:
+            state["reruns"].append(rerun)
+
+# The PERF_TOP functions with the most cumulative time
+def profile_report(profiler):
+    import io
+    import pstats
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PERF_TOP)
+    return out.getvalue()
+
+# Peak traced memory and the PERF_TOP allocation sites holding the most at the end of the run.
+# Other sessions' runs in the meantime are traced too.
+def memory_report(before):
+    import tracemalloc
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    if before is None:
+        tracemalloc.stop()
+        stats = after.statistics("lineno")
+    else:
+        stats = after.compare_to(before, "lineno")
+    return "\n".join([f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB"] + [str(stat) for stat in stats[:PERF_TOP]])
+
+# The sidebar panel: the recent runs with their totals, one run's span breakdown and capture,
+# and the whole history as a JSON download
+def perf_panel():
+    state = perf_state()
+    with state["lock"]:
+        reruns = {rerun.number: rerun for rerun in reversed(state["reruns"])}
+    with st.sidebar.expander("⏱️ Rerun timings", expanded=True):
+        if not reruns:
+            st.caption("No runs recorded yet.")
+            return
+        label = lambda number: (f"#{number} {reruns[number].page} - {reruns[number].seconds * 1000:.1f} ms "
+                                f"({time.strftime('%H:%M:%S', time.localtime(reruns[number].started))})")
+        rerun = reruns[st.selectbox("Run", list(reruns), format_func=label)]
+        lines = [f"{'span':<40} {'start ms':>9} {'ms':>9} {'share':>6}"]
+        for name, depth, offset, seconds in rerun.spans:
+            if seconds is not None:
+                lines.append(f"{'  ' * depth + name:<40} {offset * 1000:>9.1f} {seconds * 1000:>9.1f} "
+                             f"{seconds / rerun.seconds if rerun.seconds else 0:>6.0%}")
+        st.code("\n".join(lines), language=None)
+        if rerun.profile:
+            st.caption("cProfile (cumulative time)")
+            st.code(rerun.profile, language=None)
+        if rerun.memory:
+            st.caption("tracemalloc")
+            st.code(rerun.memory, language=None)
+        st.download_button("💾 Export timings", lambda: json.dumps([reruns[number].to_dict() for number in reruns], indent=2),
+                           file_name="rerun-timings.json", mime="application/json", on_click="ignore")
+
+# One book. __slots__ keeps each record small, and author/genre strings are interned so the
+# books of one author or genre share a single string. Books read like the dicts they replace
+# (book["title"], book.get("cover"), dict(book)) and serialize to the same JSON objects.
+class Book:
+    FIELDS = ("title", "author", "year", "genre", "read", "cover", "id")
+    __slots__ = FIELDS
+
+    def __init__(self, title, author="", year=0, genre="", read=False, cover="", id=None):
+        self.title = title
+        self.author = sys.intern(author)
+        self.year = year
+        self.genre = sys.intern(genre)
+        self.read = read
+        self.cover = cover
+        self.id = id
+
+    # Libraries imported from CSV before imports were normalized can hold NaN (pandas' empty
+    # cell, which json writes as NaN) in any field, and years as text: NaN text becomes "",
+    # a NaN or non-numeric year 0 and a NaN read flag False. Well-formed fields take the fast path.
+    @classmethod
+    def from_dict(cls, data):
+        title, author, year = data["title"], data.get("author", ""), data.get("year")
+        genre, read, cover = data.get("genre", ""), data.get("read"), data.get("cover")
+        return cls(title if type(title) is str else text_field(title),
+                   author if type(author) is str else text_field(author),
+                   year if type(year) is int and abs(year) < 2 ** 63 else year_field(year),
+                   genre if type(genre) is str else text_field(genre),
+                   read if type(read) is bool else bool(read) and read == read,
+                   cover if type(cover) is str else text_field(cover), data.get("id"))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def replace(self, **changes):
+        return Book.from_dict({**self.to_dict(), **changes})
+
+    def keys(self):
+        return self.FIELDS
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def get(self, field, default=None):
+        return getattr(self, field) if field in self.FIELDS else default
+
+    def __eq__(self, other):
+        return isinstance(other, Book) and all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __repr__(self):
+        return f"Book({self.to_dict()!r})"
+
+# A field as text, with None and NaN as ""
+def text_field(value):
+    return "" if value is None or value != value else str(value)
+
+# A year as an int, with empty, NaN, infinite and non-numeric values as 0, clamped to the
+# int64 range of the year columns
+def year_field(value):
+    try:
+        year = int(float(value or 0))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+    return max(-2 ** 63, min(year, 2 ** 63 - 1))
+
+# The cyclic garbage collector, paused while a snapshot's records are made: collections
+# triggered by a million new objects only re-scan them, and they form no cycles
+@contextlib.contextmanager
+def paused_gc():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+# Parse a library snapshot straight into Book records
+def read_snapshot(file):
+    with paused_gc():
+        return [Book.from_dict(data) for data in json.load(file)]
+
+# Write Book records (or dicts) in the library.json format
+def write_snapshot(library, file):
+    json.dump(list(library), file, indent=4, default=Book.to_dict)
+
+# Binary snapshot: the library as columns. SNAPSHOT_MAGIC, then the format version and the
+# length of a JSON header as little-endian uint32s, then the header, which gives the book count,
+# each column's [offset, size, dtype] and the number of strings in each string column, then
+# the columns, each 8-byte aligned:
+#   ids, years, read              one value per book (id -1 for a book without one)
+#   author.codes, genre.codes     int32 indexes into author.values and genre.values
+#   title, cover, author.values, genre.values
+#                                 UTF-8 strings joined by NUL bytes, plus a <name>.offsets
+#                                 column of byte offsets only when a string contains a NUL
+def write_binary_snapshot(library, file):
+    if isinstance(library, BookTable):
+        ids, years, read = library.column("ids"), library.column("years"), library.column("read")
+        titles, covers = library.column("titles").tolist(), library.column("covers").tolist()
+        authors, author_codes = library.authors, library.column("author_codes")
+        genres, genre_codes = library.genres, library.column("genre_codes")
+    else:
+        books = [book if isinstance(book, Book) else Book.from_dict(book) for book in library]
+        ids = np.array([-1 if book.id is None else book.id for book in books], dtype=np.int64)
+        years = np.array([book.year for book in books], dtype=np.int64)
+        read = np.array([book.read for book in books], dtype=np.bool_)
+        titles, covers = [book.title for book in books], [book.cover for book in books]
+        authors, genres = Categories(), Categories()
+        author_codes = np.array([authors.code(book.author) for book in books], dtype=np.int32)
+        genre_codes = np.array([genres.code(book.genre) for book in books], dtype=np.int32)
+    columns = {"ids": ids.astype("<i8"), "years": years.astype("<i8"), "read": read.astype("|b1"),
+               "author.codes": author_codes.astype("<i4"), "genre.codes": genre_codes.astype("<i4")}
+    header = {"books": len(ids), "columns": {}, "strings": {}}
+    for name, strings in (("title", titles), ("cover", covers), ("author.values", authors.values),
+                          ("genre.values", genres.values)):
+        header["strings"][name] = len(strings)
+        data = "\0".join(strings).encode()
+        columns[name] = np.frombuffer(data, dtype=np.uint8)
+        if strings and data.count(b"\0") != len(strings) - 1:
+            ends = np.cumsum([len(string.encode()) + 1 for string in strings])
+            columns[name + ".offsets"] = np.concatenate(([0], ends)).astype("<i8")
+    offset = 0
+    for name, column in columns.items():
+        header["columns"][name] = [offset, column.nbytes, column.dtype.str]
+        offset += -(-column.nbytes // 8) * 8
+    header = json.dumps(header).encode()
+    preamble = SNAPSHOT_MAGIC + struct.pack("<II", SNAPSHOT_VERSION, len(header)) + header
+    file.write(preamble + bytes(-len(preamble) % 8))
+    for column in columns.values():
+        file.write(column.tobytes() + bytes(-column.nbytes % 8))
+
+# The columns of a binary snapshot as arrays over its bytes (no copies), and its header
+def snapshot_columns(data):
+    if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a library snapshot")
+    version, header_size = struct.unpack_from("<II", data, len(SNAPSHOT_MAGIC))
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"Library snapshot version {version} is newer than this app reads ({SNAPSHOT_VERSION})")
+    start = len(SNAPSHOT_MAGIC) + 8
+    header = json.loads(data[start:start + header_size])
+    base = start + header_size + -(start + header_size) % 8
+    columns = {name: np.frombuffer(data, dtype=np.dtype(dtype), count=size // np.dtype(dtype).itemsize, offset=base + offset)
+               for name, (offset, size, dtype) in header["columns"].items()}
+    return columns, header
+
+# One string column of a binary snapshot, decoded in a single pass when no string contains a NUL
+def snapshot_strings(columns, header, name):
+    count = header["strings"][name]
+    if not count:
+        return []
+    data = memoryview(columns[name])
+    offsets = columns.get(name + ".offsets")
+    if offsets is None:
+        strings = str(data, "utf-8").split("\0")
+    else:
+        strings = [str(data[start:end - 1], "utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    if len(strings) != count:
+        raise ValueError(f"Library snapshot column {name} holds {len(strings)} strings, not {count}")
+    return strings
+
+# Read a binary snapshot into Book records
+def read_binary_snapshot(file):
+    columns, header = snapshot_columns(file.read())
+    authors = [sys.intern(author) for author in snapshot_strings(columns, header, "author.values")]
+    genres = [sys.intern(genre) for genre in snapshot_strings(columns, header, "genre.values")]
+    rows = zip(snapshot_strings(columns, header, "title"), columns["author.codes"].tolist(), columns["years"].tolist(),
+               columns["genre.codes"].tolist(), columns["read"].tolist(), snapshot_strings(columns, header, "cover"),
+               columns["ids"].tolist())
+    with paused_gc():
+        return [Book(title, authors[author], year, genres[genre], read, cover, None if book_id < 0 else book_id)
+                for title, author, year, genre, read, cover, book_id in rows]
+
+# Read a snapshot file in either format, told apart by the binary one's magic bytes
+def read_snapshot_file(path):
+    with open(path, "rb") as file:
+        if file.read(len(SNAPSHOT_MAGIC)) == SNAPSHOT_MAGIC:
+            file.seek(0)
+            return read_binary_snapshot(file)
+    with open(path, "r") as file:
+        return read_snapshot(file)
+
+# The snapshot files save_library writes for SNAPSHOT_FORMAT, as (path, writer, file mode).
+# JSON comes first, so that with both formats the binary file is the later one. Never empty:
+# the callers drop journal records once the snapshots are written.
+def snapshot_files():
+    files = []
+    if SNAPSHOT_FORMAT in ("json", "both"):
+        files.append((LIBRARY_FILE, write_snapshot, "w"))
+    if SNAPSHOT_FORMAT in ("binary", "both"):
+        files.append((SNAPSHOT_FILE, write_binary_snapshot, "wb"))
+    if not files:
+        raise ValueError(f"Snapshot format {SNAPSHOT_FORMAT!r} writes no snapshot file")
+    return files
+
+# The snapshot to load: the last file SNAPSHOT_FORMAT writes, or else (before the first save
+# under this format) the file of the other format. Never chosen by modification time, which
+# a copy, a restore or a checkout can bump on a stale file.
+def current_snapshot():
+    written = snapshot_files()[-1][0]
+    other = LIBRARY_FILE if written == SNAPSHOT_FILE else SNAPSHOT_FILE
+    return next((path for path in (written, other) if os.path.exists(path)), None)
+
+# Once the snapshots of SNAPSHOT_FORMAT are written, move a snapshot of the other format out
+# of the way, so it is never loaded again. Called with the journal lock held.
+def retire_other_snapshots(files):
+    for path in {LIBRARY_FILE, SNAPSHOT_FILE} - {path for path, _, _ in files}:
+        if os.path.exists(path):
+            os.replace(path, path + ".migrated")
+            sync_directory(path)
+
+# Convert a snapshot file to the other format: binary, or JSON when the target ends in .json
+def convert_snapshot(source, target):
+    library = read_snapshot_file(source)
+    if target.endswith(".json"):
+        atomic_write(target, lambda file: write_snapshot(library, file))
+    else:
+        atomic_write(target, lambda file: write_binary_snapshot(library, file), "wb")
+    return len(library)
+
+# Push a written file's data to the disk (unless syncing is off)
+def sync_file(file):
+    file.flush()
+    if JOURNAL_SYNC != "off":
+        os.fsync(file.fileno())
+
+# Make a rename or removal in the directory durable (POSIX only; Windows cannot open directories)
+def sync_directory(path):
+    if JOURNAL_SYNC == "off" or os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# Write a file through a temp file in the same directory and os.replace, so a crash or a
+# concurrent reader sees either the old contents or the new, never a truncated file
+def atomic_write(path, write, mode="w"):
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, mode) as file:
+            write(file)
+            sync_file(file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    sync_directory(path)
+
+# Group commit for the journal: every append takes a ticket, and waiting for a ticket to be
+# durable either joins the fsync already under way or leads the next one, which first waits
+# out the window so that appends from other sessions land in the same fsync
+class GroupCommit:
+    def __init__(self, path, window):
+        self.path = path
+        self.window = window
+        self.condition = threading.Condition()
+        self.appended = 0
+        self.synced = 0
+        self.flushing = False
+        self.fsyncs = 0
+
+    # Called with the journal lock held, right after an append
+    def ticket(self):
+        with self.condition:
+            self.appended += 1
+            return self.appended
+
+    def wait(self, ticket):
+        with self.condition:
+            while self.synced < ticket and self.flushing:
+                self.condition.wait()
+            if self.synced >= ticket:
+                return
+            self.flushing = True
+        target = None
+        try:
+            time.sleep(self.window)
+            with self.condition:
+                target = self.appended
+            if os.path.exists(self.path):  # Gone means a snapshot (written durably) replaced it
+                with open(self.path, "a") as file:
+                    sync_file(file)
+            self.fsyncs += 1
+        finally:
+            with self.condition:
+                self.flushing = False
+                if target is not None:
+                    self.synced = max(self.synced, target)
+                self.condition.notify_all()
+
+# Shared journal state for every session of this server process
+@st.cache_resource
+def journal_state():
+    records = 0
+    if os.path.exists(JOURNAL_FILE):
+        with open(JOURNAL_FILE, "r") as file:
+            records = sum(1 for line in file if line.strip())
+    window = JOURNAL_SYNC_WINDOW if JOURNAL_SYNC == "group" else 0
+    # "saves" counts full snapshots, so a compaction can tell one happened while it ran
+    return {"lock": threading.Lock(), "records": records, "compacting": False, "saves": 0,
+            "commit": GroupCommit(JOURNAL_FILE, window)}
+
+# Apply one journal record to a library list. positions maps book ids to their index in the
+# library, so updates and removals find their book without a scan; removed books are only
+# marked in removed (by index) and dropped in one pass once the whole journal is applied, so
+# a removal costs O(books removed) rather than a copy of the list.
+def apply_change(library, positions, removed, record):
+    if record["op"] == "add":
+        book = Book.from_dict(record["book"])
+        if book.id is not None:
+            positions[book.id] = len(library)
+        library.append(book)
+    elif record["op"] == "remove" and "ids" in record:
+        for book_id in record["ids"]:
+            index = positions.pop(book_id, None)
+            if index is not None:
+                removed.add(index)
+    elif record["op"] == "remove":
+        # Journals from before books had ids remove by title
+        for index, book in enumerate(library):
+            if index not in removed and book["title"] == record["title"]:
+                removed.add(index)
+                positions.pop(book.id, None)
+    elif record["op"] == "update":
+        # Replace rather than mutate, so readers holding the old book never see a half-applied change
+        index = positions.get(record["id"])
+        if index is not None:
+            library[index] = library[index].replace(**record["changes"])
+
+# Replay journal lines (stopping at a torn last line left by a crash). Adds of books the
+# library already holds are skipped: after a crash between writing a snapshot and resetting
+# the journal, the journal replays over a snapshot that already contains its changes.
+def replay_journal(library, lines):
+    positions = {book.id: index for index, book in enumerate(library) if book.id is not None}
+    removed = set()
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        if record["op"] == "add" and record["book"].get("id") in positions:
+            continue
+        apply_change(library, positions, removed, record)
+    if removed:
+        library[:] = [book for index, book in enumerate(library) if index not in removed]
+    return library
+
+# Load library from file: the snapshot plus every change journaled since
+@timed("journal: load library")
+def load_library():
+    snapshot = current_snapshot()
+    library = read_snapshot_file(snapshot) if snapshot else []
+    if os.path.exists(JOURNAL_FILE):
+        with open(JOURNAL_FILE, "r") as file:
+            replay_journal(library, file)
+    return library
+
+# Save library to file (full snapshot in each SNAPSHOT_FORMAT, which makes the journal obsolete)
+@timed("journal: save snapshot", "library_save_seconds")
+def save_library(library):
+    state = journal_state()
+    with state["lock"]:
+        files = snapshot_files()
+        for path, write, mode in files:
+            atomic_write(path, lambda file: write(library, file), mode)
+        retire_other_snapshots(files)
+        metrics_registry.observe("library_save_bytes", sum(os.path.getsize(path) for path, _, _ in files))
+        if os.path.exists(JOURNAL_FILE):
+            os.remove(JOURNAL_FILE)
+            sync_directory(JOURNAL_FILE)
+        state["records"] = 0
+        state["saves"] += 1
+
+# Record changes: one appended line per change in journal mode, a full rewrite in json mode.
+# Returns the group commit ticket of a journal append, for wait_durable once the caller has
+# let go of its own locks (so other sessions' appends can join the same fsync).
+@timed("journal: append")
+def log_changes(library, records):
+    if STORAGE_MODE != "journal":
+        save_library(library)
+        return None
+    state = journal_state()
+    with state["lock"]:
+        lines = [json.dumps(record, default=Book.to_dict) + "\n" for record in records]
+        with open(JOURNAL_FILE, "a") as file:
+            file.writelines(lines)
+        ticket = state["commit"].ticket()
+        metrics_registry.inc("library_journal_bytes_total", sum(map(len, lines)))  # json.dumps writes ASCII
+        state["records"] += len(records)
+        if state["records"] >= JOURNAL_COMPACT_EVERY and not state["compacting"]:
+            state["compacting"] = True
+            threading.Thread(target=compact_library, daemon=True).start()
+    return ticket
+
+# Block until the journal append with this ticket is on disk
+@timed("journal: fsync wait")
+def wait_durable(ticket):
+    if ticket is not None and JOURNAL_SYNC != "off":
+        journal_state()["commit"].wait(ticket)
+
+# Fold the journal into a fresh snapshot without blocking writers
+def compact_library():
+    state = journal_state()
+    try:
+        with state["lock"]:
+            if not os.path.exists(JOURNAL_FILE):
+                return
+            with open(JOURNAL_FILE, "r") as file:
+                head = file.read()
+            saves = state["saves"]
+
+        snapshot = current_snapshot()
+        library = read_snapshot_file(snapshot) if snapshot else []
+        replay_journal(library, head.splitlines())
+        files = snapshot_files()
+        for path, write, mode in files:
+            with open(path + ".tmp", mode) as file:
+                write(library, file)
+                sync_file(file)
+
+        # Records appended while the snapshot was being written stay in the journal
+        with state["lock"]:
+            if state["saves"] != saves:
+                for path, _, _ in files:
+                    os.remove(path + ".tmp")  # A full save already superseded this snapshot
+                return
+            with open(JOURNAL_FILE, "r") as file:
+                tail = file.read()[len(head):]
+            for path, _, _ in files:
+                os.replace(path + ".tmp", path)
+            retire_other_snapshots(files)
+            atomic_write(JOURNAL_FILE, lambda file: file.write(tail))
+            state["records"] = sum(1 for line in tail.splitlines() if line.strip())
+    finally:
+        state["compacting"] = False
+
+# Trigram inverted index, kept up to date on every add/remove, so a substring search only
+# verifies the books whose text contains all of the query's trigrams
+class SearchIndex:
+    FIELDS = ("title", "author", "genre")
+
+    def __init__(self, books=(), fields=FIELDS):
+        self.postings = {field: defaultdict(set) for field in fields}
+        for book in books:
+            self.add(book)
+
+    @staticmethod
+    def grams(text):
+        text = str(text).lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, book):
+        for field, postings in self.postings.items():
+            for gram in self.grams(book[field]):
+                postings[gram].add(book["id"])
+
+    def remove(self, book):
+        for field, postings in self.postings.items():
+            for gram in self.grams(book[field]):
+                ids = postings.get(gram)
+                if ids is not None:
+                    ids.discard(book["id"])
+                    if not ids:
+                        del postings[gram]
+
+    # Ids of the books that may contain the query, or None for queries too short to index
+    @timed("index: trigram candidates")
+    def candidates(self, field, query):
+        grams = self.grams(query)
+        if not grams:
+            return None
+        # Intersect starting from the rarest trigram
+        postings = sorted((self.postings[field].get(gram, set()) for gram in grams), key=len)
+        return postings[0].intersection(*postings[1:])
+
+
+# Trigram similarity of text to the query: the share of the query's trigrams found in the
+# text, and the Jaccard similarity of the two, which prefers the closer of equal matches
+def fuzzy_score(query_grams, text):
+    grams = SearchIndex.grams(text)
+    shared = len(query_grams & grams)
+    if not shared:
+        return 0.0, 0.0
+    return shared / len(query_grams), shared / (len(query_grams) + len(grams) - shared)
+
+
+# The k best (book, score) pairs among the candidates, scored on title or author,
+# whichever matches better; ties go to the closer match, then the older book
+@timed("index: fuzzy ranking")
+def rank_fuzzy(query, books, k):
+    grams = SearchIndex.grams(query)
+    ranked = []
+    for book in books:
+        score, closeness = max(fuzzy_score(grams, book["title"]), fuzzy_score(grams, book["author"]))
+        if score >= FUZZY_MIN_SCORE:
+            ranked.append((-score, -closeness, book["id"], book))
+    return [(book, -score) for score, _, _, book in heapq.nsmallest(k, ranked, key=lambda r: r[:3])]
+
+
+# Distinct values of a repeated string column, each stored once and referred to by an int code
+class Categories:
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+        self.gram_codes = defaultdict(set)
+        self.indexed = 0
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    # Codes of the values containing the query (case-insensitive)
+    def matching(self, query):
+        return [code for code, value in enumerate(self.values) if query in value.lower()]
+
+    # Codes of the values sharing at least min_shared of the query's trigrams, through a
+    # trigram index over the distinct values that is extended as new values appear
+    def similar(self, grams, min_shared):
+        for code in range(self.indexed, len(self.values)):
+            for gram in SearchIndex.grams(self.values[code]):
+                self.gram_codes[gram].add(code)
+        self.indexed = len(self.values)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self.gram_codes.get(gram, ()))
+        return [code for code, shared in counts.items() if shared >= min_shared]
+
+
+# Bitset over table positions, 64 positions packed per word
+class Bitmap:
+    def __init__(self):
+        self.words = np.zeros(1, dtype=np.uint64)
+        self.count = 0
+
+    def _grow(self, position):
+        words = position // 64 + 1
+        if words > len(self.words):
+            grown = np.zeros(max(words, 2 * len(self.words)), dtype=np.uint64)
+            grown[:len(self.words)] = self.words
+            self.words = grown
+
+    def get(self, position):
+        word = position // 64
+        return word < len(self.words) and bool(self.words[word] >> np.uint64(position % 64) & np.uint64(1))
+
+    # Set bits that are known to be clear (freshly appended positions)
+    def set_many(self, positions):
+        if len(positions):
+            self._grow(int(positions.max()))
+            np.bitwise_or.at(self.words, positions // 64, np.uint64(1) << (positions % 64).astype(np.uint64))
+            self.count += len(positions)
+
+    def set(self, position):
+        if not self.get(position):
+            self._grow(position)
+            self.words[position // 64] |= np.uint64(1) << np.uint64(position % 64)
+            self.count += 1
+
+    def clear(self, position):
+        if self.get(position):
+            self.words[position // 64] &= ~(np.uint64(1) << np.uint64(position % 64))
+            self.count -= 1
+
+    # The first `words` words, zero-padded
+    def head(self, words):
+        if len(self.words) >= words:
+            return self.words[:words]
+        return np.concatenate([self.words, np.zeros(words - len(self.words), dtype=np.uint64)])
+
+
+# Unpack words of a bitset into a boolean mask of `size` positions
+def unpack_bits(words, size):
+    return np.unpackbits(words.astype("<u8").view(np.uint8), bitorder="little")[:size].astype(bool)
+
+
+# The library as NumPy columns: one array per field, genre/author as categorical codes
+# and read as a boolean mask. Rows are addressed by position; self.positions maps book
+# ids to positions, and removal swaps the last row into the freed one.
+# self.orders holds, per sort key, every position in display order (ties by id) next to
+# the sorted keys; both are built on first use. Appends and removes only note which rows
+# came, went and moved since (self.pending), and the next order() patches every order with
+# the whole batch at once, so a write costs O(1) and a listing after writes O(n) rather than
+# a full re-sort.
+# self.genre_bits (per genre code) and self.read_bits are bitmaps of positions, so genre
+# and read-status filters combine with a bitwise AND.
+class BookTable:
+    COLUMNS = {"ids": np.int64, "titles": object, "author_codes": np.int32, "years": np.int64,
+               "genre_codes": np.int32, "read": np.bool_, "covers": object}
+
+    def __init__(self, books=()):
+        self.size = 0
+        self.authors = Categories()
+        self.genres = Categories()
+        self.positions = {}
+        self.orders = {}
+        self.pending = None
+        self.genre_bits = {}
+        self.read_bits = Bitmap()
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self.append(books)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self.row(position) for position in range(self.size))
+
+    def column(self, name):
+        return getattr(self, name)[:self.size]
+
+    def _reserve(self, extra):
+        if self.size + extra <= len(self.ids):
+            return
+        capacity = max(16, 2 * len(self.ids), self.size + extra)
+        for name, dtype in self.COLUMNS.items():
+            grown = np.empty(capacity, dtype=dtype)
+            grown[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, grown)
+
+    def append(self, books):
+        books = list(books)
+        pending = self._pending() if self.orders else None
+        self._reserve(len(books))
+        start, end = self.size, self.size + len(books)
+        self.ids[start:end] = [book.id for book in books]
+        self.titles[start:end] = [book.title for book in books]
+        self.author_codes[start:end] = [self.authors.code(book.author) for book in books]
+        self.years[start:end] = [book.year for book in books]
+        self.genre_codes[start:end] = [self.genres.code(book.genre) for book in books]
+        self.read[start:end] = [book.read for book in books]
+        self.covers[start:end] = [book.cover for book in books]
+        for position, book in enumerate(books, start=start):
+            self.positions[book.id] = position
+        self.size = end
+        new = np.arange(start, end)
+        new_genres = self.genre_codes[start:end]
+        for code in np.unique(new_genres):
+            self.genre_bits.setdefault(int(code), Bitmap()).set_many(new[new_genres == code])
+        self.read_bits.set_many(new[self.read[start:end]])
+        if pending is not None:
+            # Positions past the ordered size are new anyway; freed ones below it are marked
+            for position in range(start, min(end, pending["size"])):
+                pending["rows"][position] = -1
+
+    def row(self, position):
+        return Book(self.titles[position], self.authors.values[self.author_codes[position]], int(self.years[position]),
+                    self.genres.values[self.genre_codes[position]], bool(self.read[position]), self.covers[position],
+                    int(self.ids[position]))
+
+    def rows(self, positions):
+        return [self.row(position) for position in positions]
+
+    def get(self, book_id):
+        position = self.positions.get(book_id)
+        return None if position is None else self.row(position)
+
+    # Remove one book in O(1) and return it (None for unknown ids)
+    def remove(self, book_id):
+        position = self.positions.pop(book_id, None)
+        if position is None:
+            return None
+        book = self.row(position)
+        last = self.size - 1
+        pending = self._pending() if self.orders else None
+        self.genre_bits[int(self.genre_codes[position])].clear(position)
+        self.read_bits.clear(position)
+        if position != last:
+            genre_bits = self.genre_bits[int(self.genre_codes[last])]
+            genre_bits.clear(last)
+            genre_bits.set(position)
+            if self.read_bits.get(last):
+                self.read_bits.clear(last)
+                self.read_bits.set(position)
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[position] = column[last]
+            self.positions[int(self.ids[position])] = position
+        self.titles[last] = self.covers[last] = None
+        self.size = last
+        if pending is not None:
+            rows = pending["rows"]
+            ordered = rows.get(position, position if position < pending["size"] else -1)
+            if ordered >= 0:
+                pending["removed"].append(ordered)
+            moved = rows.pop(last, last if last < pending["size"] else -1)
+            if position != last:
+                rows[position] = moved
+        return book
+
+    # Changes since the orders were last brought up to date: the size they cover, the
+    # removed rows (as positions in the orders), and for every position whose row changed,
+    # the row's position in the orders or -1 for a row they do not hold yet
+    def _pending(self):
+        if self.pending is None:
+            self.pending = {"size": self.size, "removed": [], "rows": {}}
+        return self.pending
+
+    # Bring every order up to date with the pending changes: drop removed rows, renumber
+    # moved ones and merge the new rows in by key
+    def _apply_pending(self):
+        pending, self.pending = self.pending, None
+        if pending is None or not self.orders:
+            return
+        size = pending["size"]
+        current = np.arange(size)
+        current[np.array(pending["removed"], dtype=np.int64)] = -1
+        added = []
+        for position, ordered in pending["rows"].items():
+            if ordered >= 0:
+                current[ordered] = position
+            elif position < size:
+                added.append(position)
+        new = np.concatenate([np.array(added, dtype=np.int64), np.arange(size, self.size)])
+        # Equal keys stay in id order: the new rows are sorted by id, and their ids are the
+        # highest, so they go after every equal key
+        new = new[np.argsort(self.ids[new], kind="stable")]
+        for sort_by, (order, keys) in self.orders.items():
+            order = current[order]
+            kept = order >= 0
+            order, keys = order[kept], keys[kept]
+            new_keys = self.sort_keys(sort_by, new)
+            by_key = np.argsort(new_keys, kind="stable")
+            at = np.searchsorted(keys, new_keys[by_key], side="right")
+            self.orders[sort_by] = (np.insert(order, at, new[by_key]), np.insert(keys, at, new_keys[by_key]))
+
+    # Boolean mask of the positions matching a genre (None for all) and read status (None for both)
+    def filter_mask(self, genre=None, read=None):
+        words = (self.size + 63) // 64
+        if genre is None:
+            bits = np.full(words, np.iinfo(np.uint64).max, dtype=np.uint64)
+        else:
+            code = self.genres.codes.get(genre)
+            if code not in self.genre_bits:
+                return np.zeros(self.size, dtype=bool)
+            bits = self.genre_bits[code].head(words)
+        if read is not None:
+            read_bits = self.read_bits.head(words)
+            bits = bits & (read_bits if read else ~read_bits)
+        return unpack_bits(bits, self.size)
+
+    # Genres that at least one book has, straight from the bitmap keys
+    def genre_names(self):
+        return [self.genres.values[code] for code, bits in self.genre_bits.items() if bits.count]
+
+    # Sort keys of the rows at these positions: titles, author names, or years descending
+    def sort_keys(self, sort_by, positions):
+        if sort_by == "title":
+            return self.titles[positions]
+        if sort_by == "author":
+            return np.array(self.authors.values, dtype=object)[self.author_codes[positions]]
+        return -self.years[positions]
+
+    # Every position in sort_by order, ties in id order
+    def order(self, sort_by):
+        self._apply_pending()
+        if sort_by not in self.orders:
+            by_id = np.argsort(self.column("ids"), kind="stable")
+            keys = self.sort_keys(sort_by, by_id)
+            by_key = np.argsort(keys, kind="stable")
+            self.orders[sort_by] = (by_id[by_key], keys[by_key])
+        return self.orders[sort_by][0]
+
+    # Independent copy of the live rows, for readers that iterate outside the storage lock
+    def copy(self):
+        table = BookTable.__new__(BookTable)
+        table.size = self.size
+        table.authors, table.genres = self.authors, self.genres  # Append-only, safe to share
+        table.positions = {}
+        table.orders = {}
+        table.pending = None
+        table.genre_bits = {}
+        table.read_bits = Bitmap()
+        for name in self.COLUMNS:
+            setattr(table, name, getattr(self, name)[:self.size].copy())
+        return table
+
+    def frame(self, positions):
+        import pandas as pd
+        return pd.DataFrame({
+            "id": self.ids[positions],
+            "title": self.titles[positions],
+            "author": pd.Categorical.from_codes(self.author_codes[positions], self.authors.values),
+            "year": self.years[positions],
+            "genre": pd.Categorical.from_codes(self.genre_codes[positions], self.genres.values),
+            "read": self.read[positions],
+            "cover": self.covers[positions],
+        })
+
+
+# Counter with a lazy max-heap: stale heap entries are dropped when they reach the top,
+# so the most common keys come out in O(log n) instead of a full count
+class TopCounter:
+    def __init__(self):
+        self.counts = Counter()
+        self.heap = []
+
+    def _push(self, key):
+        heapq.heappush(self.heap, (-self.counts[key], key))
+        if len(self.heap) > 2 * len(self.counts) + 64:
+            self.heap = [(-count, key) for key, count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def add(self, key):
+        self.counts[key] += 1
+        self._push(key)
+
+    def remove(self, key):
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key]
+        else:
+            self._push(key)
+
+    # Most common keys first; ties go to the smallest key, like pandas' mode()
+    def top(self, k=1):
+        result, seen = [], set()
+        while self.heap and len(result) < k:
+            count, key = heapq.heappop(self.heap)
+            if key in seen or self.counts.get(key) != -count:
+                continue
+            seen.add(key)
+            result.append((key, -count))
+        for key, count in result:
+            heapq.heappush(self.heap, (-count, key))
+        return result
+
+
+# Running totals behind the Statistics page, updated on every add/remove
+class LibraryStats:
+    def __init__(self, books=()):
+        self.total = 0
+        self.read = 0
+        self.genres = TopCounter()
+        self.authors = TopCounter()
+        for book in books:
+            self.add(book)
+
+    def add(self, book):
+        self.total += 1
+        self.read += bool(book["read"])
+        self.genres.add(book["genre"])
+        self.authors.add(book["author"])
+
+    def remove(self, book):
+        self.total -= 1
+        self.read -= bool(book["read"])
+        self.genres.remove(book["genre"])
+        self.authors.remove(book["author"])
+
+    def snapshot(self, k=5):
+        top_genres = self.genres.top(k)
+        top_authors = self.authors.top(k)
+        return {
+            "total": self.total,
+            "read": self.read,
+            "unread": self.total - self.read,
+            "top_genre": top_genres[0][0] if top_genres else "N/A",
+            "top_author": top_authors[0][0] if top_authors else "N/A",
+            "top_genres": top_genres,
+            "top_authors": top_authors,
+        }
+
+
+# Normalized (title, author, year) key of every book, mapped to the book's id, so an
+# incoming book is checked for a duplicate with one dict lookup
+class DuplicateIndex:
+    def __init__(self, books=()):
+        self.ids = {}
+        for book in books:
+            self.add(book)
+
+    @staticmethod
+    def key(book):
+        return (" ".join(str(book["title"]).casefold().split()),
+                " ".join(str(book["author"]).casefold().split()), str(book["year"]).strip())
+
+    # Books already duplicated in the library keep the first one indexed
+    def add(self, book):
+        self.ids.setdefault(self.key(book), book["id"])
+
+    def remove(self, book):
+        key = self.key(book)
+        if self.ids.get(key) == book["id"]:
+            del self.ids[key]
+
+    def lookup(self, key):
+        return self.ids.get(key)
+
+    def find(self, book):
+        return self.ids.get(self.key(book))
+
+
+# The same lookups over the dup_key column of an SQLite table (indexed), for books that are
+# not held in memory
+class SqliteDuplicateIndex:
+    def __init__(self, conn, table):
+        self.conn = conn
+        self.table = table
+
+    @staticmethod
+    def key(book):
+        return "\x1f".join(DuplicateIndex.key(book))
+
+    def lookup(self, key):
+        return self.conn.execute(f"SELECT MIN(id) FROM {self.table} WHERE dup_key = ?", (key,)).fetchone()[0]
+
+    def find(self, book):
+        return self.lookup(self.key(book))
+
+
+# The duplicate of existing under the policy: existing itself for "skip", existing with its
+# empty fields filled in from incoming for "merge", incoming under existing's id for "replace"
+def merge_book(existing, incoming, policy):
+    if policy == "merge":
+        return Book.from_dict({field: existing[field] or incoming[field] for field in Book.FIELDS})
+    if policy == "replace":
+        return incoming.replace(id=existing["id"])
+    return existing
+
+
+# Sort incoming books (or dicts) against the index: the new books to add, the updated
+# existing books, and how many duplicates were found, including repeats within the batch.
+# A policy of None adds everything, duplicates included.
+def resolve_duplicates(index, books, policy, get):
+    books = [book if isinstance(book, Book) else Book.from_dict(book) for book in books]
+    if policy is None:
+        return books, [], 0
+    new, pending, updates, duplicates = [], {}, {}, 0
+    for book in books:
+        key = index.key(book)
+        if key in pending:
+            new[pending[key]] = merge_book(new[pending[key]], book, policy)
+            duplicates += 1
+            continue
+        book_id = index.lookup(key)
+        if book_id is None:
+            pending[key] = len(new)
+            new.append(book)
+            continue
+        if policy != "skip":
+            updates[book_id] = merge_book(updates.get(book_id) or get(book_id), book, policy)
+        duplicates += 1
+    return new, [book for book in updates.values() if book != get(book.id)], duplicates
+
+
+# JSON storage: the library held in memory as a BookTable, persisted through
+# load_library/save_library. Every write goes through self.lock and bumps self.version;
+# readers get Book records built from the columns, never the columns themselves.
+class JsonStorage:
+    # library: the books to hold instead of the saved library (a replace stages into one)
+    def __init__(self, library=None):
+        library = load_library() if library is None else library
+        self.lock = threading.RLock()
+        self.version = 0
+        # Libraries saved before books had ids get them once, persisted with a full save
+        if any(book.id is None for book in library):
+            self.next_id = max((book.id for book in library if book.id is not None), default=0) + 1
+            library = [book if book.id is not None else self._with_id(book) for book in library]
+            save_library(library)
+        self.next_id = max((book.id for book in library), default=0) + 1
+        self.table = BookTable(library)
+        self.search_index = SearchIndex(library, fields=("title",))
+        self.stats_index = LibraryStats(library)
+        self.duplicates = DuplicateIndex(library)
+        # Filtered and sorted listings (arrays of table positions), valid for self.listings_version
+        self.listings = {}
+        self.listings_version = self.version
+        # Fuzzy search results by (query, k), valid for self.fuzzy_version
+        self.fuzzy_results = {}
+        self.fuzzy_version = self.version
+        # Book picker labels by id, valid for self.labels_version
+        self.book_labels = {}
+        self.labels_version = None
+
+    # A Book record of the given book (or dict) carrying the next free id
+    def _with_id(self, book):
+        book = Book.from_dict({**book, "id": self.next_id})
+        self.next_id += 1
+        return book
+
+    @storage_timed("books")
+    def books(self):
+        with self.lock:
+            return self.table.copy()
+
+    @storage_timed("count")
+    def count(self):
+        return len(self.table)
+
+    # Table positions shift as books are removed; the ids come out sorted (insertion order)
+    @storage_timed("ids")
+    def ids(self):
+        with self.lock:
+            return np.sort(self.table.column("ids")).tolist()
+
+    # "Title - Author (year)" for every book by id, in id order, built column by column once
+    # per library version (the Remove Book pickers label every book on each rerun)
+    @storage_timed("labels")
+    def labels(self):
+        with self.lock:
+            if self.labels_version != self.version:
+                table = self.table
+                by_id = np.argsort(table.column("ids"), kind="stable")
+                authors = np.array(table.authors.values, dtype=object)[table.author_codes[by_id]]
+                years = table.years[by_id].astype(str).astype(object)
+                labels = table.titles[by_id] + " - " + authors + " (" + years + ")"
+                self.book_labels = dict(zip(table.ids[by_id].tolist(), labels.tolist()))
+                self.labels_version = self.version
+            return self.book_labels
+
+    def get(self, book_id):
+        with self.lock:
+            return self.table.get(book_id)
+
+    @storage_timed("add")
+    def add(self, book, on_duplicate=DUPLICATE_POLICY):
+        return self.add_many([book], on_duplicate)
+
+    # Id of the library's copy of the book, or None if it is not in the library
+    @storage_timed("duplicate_of")
+    def duplicate_of(self, book):
+        with self.lock:
+            return self.duplicates.find(book)
+
+    # Adds the books, handling the ones already in the library by on_duplicate;
+    # returns how many duplicates there were. Like every write, it returns once the change
+    # is on disk, but waits for that outside the lock.
+    @storage_timed("add_many")
+    def add_many(self, books, on_duplicate=DUPLICATE_POLICY):
+        ticket = None
+        with self.lock:
+            books, updates, duplicates = resolve_duplicates(self.duplicates, books, on_duplicate, self.table.get)
+            books = [self._with_id(book) for book in books]
+            self._insert(books)
+            records = [{"op": "add", "book": book} for book in books]
+            if updates:
+                for book in updates:
+                    self._delete(book.id)
+                self._insert(updates)
+                records += [{"op": "update", "id": book.id, "changes": {field: book[field] for field in Book.FIELDS if field != "id"}}
+                            for book in updates]
+            if records:
+                ticket = log_changes(self.table, records)
+                self.version += 1
+        wait_durable(ticket)
+        return duplicates
+
+    # Table and index bookkeeping shared by adds, updates and removals
+    def _insert(self, books):
+        self.table.append(books)
+        for book in books:
+            self.search_index.add(book)
+            self.stats_index.add(book)
+            self.duplicates.add(book)
+
+    def _delete(self, book_id):
+        book = self.table.remove(book_id)
+        if book is not None:
+            self.search_index.remove(book)
+            self.stats_index.remove(book)
+            self.duplicates.remove(book)
+        return book
+
+    @storage_timed("remove")
+    def remove(self, book_id):
+        return self.remove_many([book_id])
+
+    # O(1) per book; one journal record per batch
+    @storage_timed("remove_many")
+    def remove_many(self, book_ids):
+        ticket = None
+        with self.lock:
+            removed = [book_id for book_id in book_ids if self._delete(book_id) is not None]
+            if removed:
+                ticket = log_changes(self.table, [{"op": "remove", "ids": removed}])
+                self.version += 1
+        wait_durable(ticket)
+        return removed
+
+    @storage_timed("replace")
+    def replace(self, books, on_duplicate=DUPLICATE_POLICY):
+        return self.replace_chunks([books], on_duplicate)
+
+    # Replace the library with the books of chunks (lists of books or dicts). Each chunk is
+    # resolved against the ones before it and staged in a fresh table and indexes without
+    # holding the lock, so a failure while the chunks are read leaves the library as it was;
+    # the staged library is swapped in and saved at the end. Returns the duplicate count.
+    @storage_timed("replace_chunks")
+    def replace_chunks(self, chunks, on_duplicate=DUPLICATE_POLICY):
+        staged = JsonStorage(library=[])
+        duplicates = 0
+        for books in chunks:
+            books, updates, found = resolve_duplicates(staged.duplicates, books, on_duplicate, staged.table.get)
+            with self.lock:
+                first_id = self.next_id
+                self.next_id += len(books)
+            staged._insert([book.replace(id=book_id) for book_id, book in enumerate(books, first_id)])
+            for book in updates:
+                staged._delete(book.id)
+            staged._insert(updates)
+            duplicates += found
+        with self.lock:
+            self.table, self.search_index = staged.table, staged.search_index
+            self.stats_index, self.duplicates = staged.stats_index, staged.duplicates
+            save_library(self.table)
+            self.version += 1
+        return duplicates
+
+    # Table positions ordered by book id (insertion order)
+    def _by_id(self, positions):
+        return positions[np.argsort(self.table.ids[positions], kind="stable")]
+
+    @storage_timed("search")
+    def search(self, field, query):
+        query = query.lower()
+        with self.lock:
+            # Read under the lock: a replace swaps in a new table and search index together
+            table = self.table
+            if field == "title":
+                ids = self.search_index.candidates("title", query)
+                if ids is None:
+                    positions = np.arange(table.size)
+                else:
+                    positions = np.fromiter((table.positions[book_id] for book_id in ids), dtype=np.int64, count=len(ids))
+                positions = np.array([p for p in positions if query in table.titles[p].lower()], dtype=np.int64)
+            elif field in ("author", "genre"):
+                categories, codes = (table.authors, table.author_codes) if field == "author" else (table.genres, table.genre_codes)
+                positions = np.flatnonzero(np.isin(codes[:table.size], categories.matching(query)))
+            else:
+                years = table.column("years").astype(str)
+                positions = np.flatnonzero(np.char.find(years, query) >= 0)
+            return table.rows(self._by_id(positions))
+
+    # Candidates for a fuzzy query: the titles sharing the most trigrams with it, counted over
+    # the rarest postings first until the budget runs out, and the books of similar authors
+    @timed("index: fuzzy candidates")
+    def _fuzzy_candidates(self, query):
+        table = self.table
+        grams = SearchIndex.grams(query)
+        counts = Counter()
+        budget = FUZZY_POSTINGS_BUDGET
+        postings = self.search_index.postings["title"]
+        for ids in sorted((postings.get(gram, ()) for gram in grams), key=len):
+            # Over budget: count what the budget allows of this trigram and stop
+            counts.update(itertools.islice(ids, budget))
+            budget -= len(ids)
+            if budget <= 0:
+                break
+        positions = [table.positions[book_id] for book_id, _ in counts.most_common(FUZZY_CANDIDATES)]
+        authors = table.authors.similar(grams, FUZZY_MIN_SCORE * len(grams))
+        if authors:
+            positions.extend(np.flatnonzero(np.isin(table.author_codes[:table.size], authors))[:FUZZY_CANDIDATES])
+        return table.rows(np.unique(np.array(positions, dtype=np.int64)))
+
+    # Ranked, typo-tolerant search over title and author: the top k (book, score) pairs,
+    # memoized until the library changes
+    @storage_timed("fuzzy_search")
+    def fuzzy_search(self, query, k=FUZZY_RESULTS):
+        query = " ".join(query.lower().split())
+        with self.lock:
+            if self.fuzzy_version != self.version or len(self.fuzzy_results) >= FUZZY_CACHE_SIZE:
+                self.fuzzy_results = {}
+                self.fuzzy_version = self.version
+            results = self.fuzzy_results.get((query, k))
+            if results is None:
+                results = self.fuzzy_results[(query, k)] = rank_fuzzy(query, self._fuzzy_candidates(query), k)
+            return results
+
+    @storage_timed("by_read")
+    def by_read(self, read):
+        with self.lock:
+            return self.table.rows(self._by_id(np.flatnonzero(self.table.column("read") == read)))
+
+    # Distinct cover paths in use
+    @storage_timed("covers")
+    def covers(self):
+        with self.lock:
+            return set(self.table.column("covers")) - {""}
+
+    @storage_timed("by_covers")
+    def by_covers(self, cover_paths):
+        with self.lock:
+            return self.table.rows(self._by_id(np.flatnonzero(np.isin(self.table.column("covers"), cover_paths))))
+
+    @storage_timed("genres")
+    def genres(self):
+        with self.lock:
+            return sorted(self.table.genre_names())
+
+    # Positions of the filtered, sorted listing: the table's maintained sort order with
+    # the filter mask applied (O(n), no sorting), cached until the library changes
+    def _listing(self, genre, read, sort_by):
+        table = self.table
+        order = table.order(sort_by)
+        if genre is None and read is None:
+            return order
+        key = (genre, read, sort_by)
+        if self.listings_version != self.version:
+            self.listings = {}
+            self.listings_version = self.version
+        positions = self.listings.get(key)
+        if positions is None:
+            mask = table.filter_mask(genre, read)
+            positions = self.listings[key] = order[mask[order]]
+        return positions
+
+    @storage_timed("list_books")
+    def list_books(self, genre=None, read=None, sort_by="title"):
+        with self.lock:
+            return self.table.rows(self._listing(genre, read, sort_by))
+
+    @storage_timed("count_books")
+    def count_books(self, genre=None, read=None, sort_by="title"):
+        with self.lock:
+            return len(self._listing(genre, read, sort_by))
+
+    # One page of a listing; turning pages reuses the cached listing
+    @storage_timed("list_page")
+    def list_page(self, genre=None, read=None, sort_by="title", page=1, page_size=25):
+        start = (page - 1) * page_size
+        with self.lock:
+            return self.table.rows(self._listing(genre, read, sort_by)[start:start + page_size])
+
+    # The listing (or one page of it) as a DataFrame, built column by column
+    @storage_timed("frame")
+    def frame(self, genre=None, read=None, sort_by="title", page=1, page_size=None):
+        with self.lock:
+            positions = self._listing(genre, read, sort_by)
+            if page_size is not None:
+                start = (page - 1) * page_size
+                positions = positions[start:start + page_size]
+            return self.table.frame(positions)
+
+    @storage_timed("stats")
+    def stats(self):
+        with self.lock:
+            return self.stats_index.snapshot()
+
+
+# SQLite storage: books live in SQLITE_FILE and every page issues targeted, indexed queries
+class SqliteStorage:
+    SELECT = "SELECT id, title, author, year, genre, read, cover FROM books"
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.version = 0
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS books (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    year INTEGER NOT NULL DEFAULT 0,
+                    genre TEXT NOT NULL DEFAULT '',
+                    read INTEGER NOT NULL DEFAULT 0,
+                    cover TEXT NOT NULL DEFAULT '',
+                    dup_key TEXT NOT NULL DEFAULT ''
+                )""")
+            self._add_duplicate_keys()
+            for column in ("title", "author", "year", "genre", "read", "dup_key"):
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_books_{column} ON books({column})")
+            self.fts = self._create_search_index()
+            if self.fts:
+                # Per-trigram document counts, so fuzzy search can skip the commonest trigrams
+                self.conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS books_fts_vocab USING fts5vocab(books_fts, 'row')")
+        self.fuzzy_results = {}
+        self.fuzzy_version = self.version
+        self.book_labels = {}
+        self.labels_version = None
+        # Numbers the temporary tables replace_chunks stages imports in
+        self.stagings = itertools.count()
+        self.stats_index = LibraryStats(self.conn.execute("SELECT author, genre, read FROM books"))
+        self.duplicates = SqliteDuplicateIndex(self.conn, "books")
+        # First start on SQLite: bring over the existing JSON library as it is
+        if self.count() == 0 and (current_snapshot() or os.path.exists(JOURNAL_FILE)):
+            self.add_many(load_library(), on_duplicate=None)
+
+    # Databases created before the dup_key column get it, filled in a batch at a time
+    def _add_duplicate_keys(self):
+        if "dup_key" not in [row["name"] for row in self.conn.execute("PRAGMA table_info(books)")]:
+            self.conn.execute("ALTER TABLE books ADD COLUMN dup_key TEXT NOT NULL DEFAULT ''")
+        while True:
+            rows = self.conn.execute("SELECT id, title, author, year FROM books WHERE dup_key = '' LIMIT 10000").fetchall()
+            if not rows:
+                return
+            self.conn.executemany("UPDATE books SET dup_key = ? WHERE id = ?",
+                                  [(SqliteDuplicateIndex.key(row), row["id"]) for row in rows])
+
+    # FTS5 trigram index kept in sync by triggers; LIKE '%...%' on it is served from the index
+    def _create_search_index(self):
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'").fetchone():
+            return True
+        try:
+            self.conn.execute("""
+                CREATE VIRTUAL TABLE books_fts USING fts5(
+                    title, author, genre, content='books', content_rowid='id', tokenize='trigram'
+                )""")
+        except sqlite3.OperationalError:
+            return False  # SQLite built without FTS5 trigram support: fall back to scanning LIKE
+        self.conn.executescript("""
+            CREATE TRIGGER books_fts_insert AFTER INSERT ON books BEGIN
+                INSERT INTO books_fts (rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+            END;
+            CREATE TRIGGER books_fts_delete AFTER DELETE ON books BEGIN
+                INSERT INTO books_fts (books_fts, rowid, title, author, genre) VALUES ('delete', old.id, old.title, old.author, old.genre);
+            END;
+            CREATE TRIGGER books_fts_update AFTER UPDATE ON books BEGIN
+                INSERT INTO books_fts (books_fts, rowid, title, author, genre) VALUES ('delete', old.id, old.title, old.author, old.genre);
+                INSERT INTO books_fts (rowid, title, author, genre) VALUES (new.id, new.title, new.author, new.genre);
+            END;
+        """)
+        self.conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+        return True
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [Book(row["title"], row["author"], row["year"], row["genre"], bool(row["read"]), row["cover"], row["id"])
+                for row in rows]
+
+    # Column values of the books, duplicate key last
+    def _rows(self, books):
+        return [(book["title"], book["author"], int(book["year"]), book["genre"], int(bool(book["read"])), book.get("cover") or "",
+                 SqliteDuplicateIndex.key(book))
+                for book in books]
+
+    # Inserts the books under ids following the current largest one, so the indexes can
+    # record them without reading them back
+    def _insert(self, books):
+        first_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM books").fetchone()[0]
+        books = [book.replace(id=book_id) for book_id, book in enumerate(books, first_id)]
+        self.conn.executemany(
+            "INSERT INTO books (id, title, author, year, genre, read, cover, dup_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(book.id, *row) for book, row in zip(books, self._rows(books))])
+        for book in books:
+            self.stats_index.add(book)
+
+    @storage_timed("books")
+    def books(self):
+        return self._query(f"{self.SELECT} ORDER BY id")
+
+    @storage_timed("count")
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    @storage_timed("ids")
+    def ids(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT id FROM books ORDER BY id")]
+
+    @storage_timed("labels")
+    def labels(self):
+        with self.lock:
+            if self.labels_version != self.version:
+                self.book_labels = dict(self.conn.execute(
+                    "SELECT id, title || ' - ' || author || ' (' || year || ')' FROM books ORDER BY id").fetchall())
+                self.labels_version = self.version
+            return self.book_labels
+
+    def get(self, book_id):
+        rows = self._query(f"{self.SELECT} WHERE id = ?", (book_id,))
+        return rows[0] if rows else None
+
+    @storage_timed("add")
+    def add(self, book, on_duplicate=DUPLICATE_POLICY):
+        return self.add_many([book], on_duplicate)
+
+    @storage_timed("duplicate_of")
+    def duplicate_of(self, book):
+        with self.lock:
+            return self.duplicates.find(book)
+
+    @storage_timed("add_many")
+    def add_many(self, books, on_duplicate=DUPLICATE_POLICY):
+        with self.lock, self.conn:
+            books, updates, duplicates = resolve_duplicates(self.duplicates, books, on_duplicate, self.get)
+            self._insert(books)
+            for book in updates:
+                old = self.get(book.id)
+                self.conn.execute(
+                    "UPDATE books SET title = ?, author = ?, year = ?, genre = ?, read = ?, cover = ?, dup_key = ? WHERE id = ?",
+                    (*self._rows([book])[0], book.id))
+                self.stats_index.remove(old)
+                self.stats_index.add(book)
+            if books or updates:
+                self.version += 1
+            return duplicates
+
+    @storage_timed("remove")
+    def remove(self, book_id):
+        return self.remove_many([book_id])
+
+    @storage_timed("remove_many")
+    def remove_many(self, book_ids):
+        removed = []
+        with self.lock, self.conn:
+            for book_id in book_ids:
+                row = self.conn.execute(
+                    "SELECT id, title, author, year, genre, read FROM books WHERE id = ?", (book_id,)).fetchone()
+                if row is None:
+                    continue
+                self.conn.execute("DELETE FROM books WHERE id = ?", (book_id,))
+                self.stats_index.remove(row)
+                removed.append(book_id)
+            self.version += 1
+        return removed
+
+    @storage_timed("replace")
+    def replace(self, books, on_duplicate=DUPLICATE_POLICY):
+        return self.replace_chunks([books], on_duplicate)
+
+    # Replace the library with the books of chunks (lists of books or dicts). Each chunk is
+    # resolved against the ones before it and written to a temporary table, holding the lock
+    # only for that write, so a failure while the chunks are read leaves the library as it
+    # was; the staged rows replace the books in one transaction at the end. Renumbers the
+    # books from 1. Returns the duplicate count.
+    @storage_timed("replace_chunks")
+    def replace_chunks(self, chunks, on_duplicate=DUPLICATE_POLICY):
+        staging = f"staged_books_{next(self.stagings)}"
+        columns = "title, author, year, genre, read, cover, dup_key"
+        with self.lock, self.conn:
+            self.conn.execute(f"CREATE TEMP TABLE {staging} (id INTEGER PRIMARY KEY, title TEXT, author TEXT, "
+                              f"year INTEGER, genre TEXT, read INTEGER, cover TEXT, dup_key TEXT)")
+            self.conn.execute(f"CREATE INDEX temp.idx_{staging}_dup_key ON {staging}(dup_key)")
+        index = SqliteDuplicateIndex(self.conn, staging)
+        get = lambda book_id: next(iter(self._query(f"SELECT id, {columns} FROM {staging} WHERE id = ?", (book_id,))), None)
+        duplicates = 0
+        try:
+            for books in chunks:
+                with self.lock, self.conn:
+                    books, updates, found = resolve_duplicates(index, books, on_duplicate, get)
+                    self.conn.executemany(f"INSERT INTO {staging} ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                          self._rows(books))
+                    self.conn.executemany(
+                        f"UPDATE {staging} SET title = ?, author = ?, year = ?, genre = ?, read = ?, cover = ?, dup_key = ? WHERE id = ?",
+                        [(*row, book.id) for book, row in zip(updates, self._rows(updates))])
+                duplicates += found
+            with self.lock, self.conn:
+                self.conn.execute("DELETE FROM books")
+                self.conn.execute(f"INSERT INTO books (id, {columns}) SELECT id, {columns} FROM {staging}")
+                self.stats_index = LibraryStats(self.conn.execute("SELECT author, genre, read FROM books"))
+                self.version += 1
+        finally:
+            with self.lock, self.conn:
+                self.conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        return duplicates
+
+    @storage_timed("search")
+    def search(self, field, query):
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        if self.fts and field in SearchIndex.FIELDS and len(query) >= 3:
+            return self._query(
+                f"{self.SELECT} WHERE id IN "
+                f"(SELECT rowid FROM books_fts WHERE {field} LIKE ? ESCAPE '\\') ORDER BY id", (pattern,))
+        column = "CAST(year AS TEXT)" if field == "year" else field
+        return self._query(
+            f"{self.SELECT} WHERE {column} LIKE ? ESCAPE '\\' ORDER BY id", (pattern,))
+
+    # Candidates for a fuzzy query: the books FTS5 ranks best for any of the query's trigrams,
+    # leaving out the commonest trigrams once their documents exceed the budget
+    @timed("index: fuzzy candidates")
+    def _fuzzy_candidates(self, query):
+        grams = sorted(SearchIndex.grams(query))
+        if not grams:
+            return []
+        if not self.fts:
+            return self.books()
+        with self.lock:
+            docs = dict(self.conn.execute(
+                f"SELECT term, doc FROM books_fts_vocab WHERE term IN ({', '.join('?' * len(grams))})", grams).fetchall())
+        kept, budget = [], FUZZY_POSTINGS_BUDGET
+        for gram in sorted((gram for gram in grams if gram in docs), key=docs.get):
+            if docs[gram] > budget and kept:
+                break
+            kept.append(gram)
+            budget -= docs[gram]
+        if not kept:
+            return []
+        match = "{title author} : (" + " OR ".join('"' + gram.replace('"', '""') + '"' for gram in kept) + ")"
+        return self._query(
+            f"{self.SELECT} WHERE id IN "
+            f"(SELECT rowid FROM books_fts WHERE books_fts MATCH ? ORDER BY rank LIMIT ?)", (match, FUZZY_CANDIDATES))
+
+    @storage_timed("fuzzy_search")
+    def fuzzy_search(self, query, k=FUZZY_RESULTS):
+        query = " ".join(query.lower().split())
+        with self.lock:
+            if self.fuzzy_version != self.version or len(self.fuzzy_results) >= FUZZY_CACHE_SIZE:
+                self.fuzzy_results = {}
+                self.fuzzy_version = self.version
+            results = self.fuzzy_results.get((query, k))
+            if results is None:
+                results = self.fuzzy_results[(query, k)] = rank_fuzzy(query, self._fuzzy_candidates(query), k)
+            return results
+
+    @storage_timed("by_read")
+    def by_read(self, read):
+        return self._query(f"{self.SELECT} WHERE read = ? ORDER BY id", (int(read),))
+
+    @storage_timed("covers")
+    def covers(self):
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT DISTINCT cover FROM books WHERE cover != ''")}
+
+    @storage_timed("by_covers")
+    def by_covers(self, cover_paths):
+        if not cover_paths:
+            return []
+        return self._query(f"{self.SELECT} WHERE cover IN ({', '.join('?' * len(cover_paths))}) ORDER BY id", cover_paths)
+
+    @storage_timed("genres")
+    def genres(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT genre FROM books ORDER BY genre")]
+
+    def _where(self, genre, read):
+        where, params = [], []
+        if genre is not None:
+            where.append("genre = ?")
+            params.append(genre)
+        if read is not None:
+            where.append("read = ?")
+            params.append(int(read))
+        return (" WHERE " + " AND ".join(where) if where else ""), params
+
+    @storage_timed("list_books")
+    def list_books(self, genre=None, read=None, sort_by="title"):
+        where, params = self._where(genre, read)
+        order = f" ORDER BY {sort_by} {'DESC' if sort_by == 'year' else 'ASC'}, id"
+        return self._query(self.SELECT + where + order, params)
+
+    @storage_timed("count_books")
+    def count_books(self, genre=None, read=None, sort_by="title"):
+        where, params = self._where(genre, read)
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM books" + where, params).fetchone()[0]
+
+    @storage_timed("list_page")
+    def list_page(self, genre=None, read=None, sort_by="title", page=1, page_size=25):
+        where, params = self._where(genre, read)
+        order = f" ORDER BY {sort_by} {'DESC' if sort_by == 'year' else 'ASC'}, id"
+        return self._query(self.SELECT + where + order + " LIMIT ? OFFSET ?", params + [page_size, (page - 1) * page_size])
+
+    @storage_timed("frame")
+    def frame(self, genre=None, read=None, sort_by="title", page=1, page_size=None):
+        where, params = self._where(genre, read)
+        order = f" ORDER BY {sort_by} {'DESC' if sort_by == 'year' else 'ASC'}, id"
+        if page_size is not None:
+            order += " LIMIT ? OFFSET ?"
+            params = params + [page_size, (page - 1) * page_size]
+        import pandas as pd
+        with self.lock:
+            df = pd.read_sql_query(self.SELECT + where + order, self.conn, params=params)
+        return df.astype({"read": bool})
+
+    @storage_timed("stats")
+    def stats(self):
+        with self.lock:
+            return self.stats_index.snapshot()
+
+
+# Pick the storage backend: "json" for small libraries, "sqlite" for large ones
+@timed("storage: open")
+def open_storage():
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteStorage(SQLITE_FILE)
+    return JsonStorage()
+
+# One catalogue per server process, shared by every session instead of a copy each
+@st.cache_resource
+def shared_storage():
+    storage = open_storage()
+    metrics_registry.collect("library_books", storage.count)
+    return storage
+
+
+# Shrink a cover image (path or uploaded file) to a THUMB_SIZE WebP thumbnail
+@timed("thumbnails: make")
+def make_thumbnail(source):
+    import io
+    from PIL import Image, ImageOps
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image.thumbnail(THUMB_SIZE)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=THUMB_QUALITY)
+    return buffer.getvalue()
+
+# Thumbnail and perceptual hash of an uploaded cover, both made before anything is written;
+# ValueError for a file PIL cannot read as an image
+def read_cover(source):
+    from PIL import Image
+    try:
+        source.seek(0)
+        thumbnail = make_thumbnail(source)
+        source.seek(0)
+        return thumbnail, cover_hash(source)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as error:
+        raise ValueError(f"Not a readable image: {error}") from error
+
+# Cover thumbnails in a size-bounded LRU in memory, backed by a size-bounded directory on disk.
+# Thumbnails are made at upload time; covers added before that are thumbnailed on first view.
+class ThumbnailCache:
+    def __init__(self, directory, disk_limit, memory_limit):
+        self.directory = directory
+        self.disk_limit = disk_limit
+        self.memory_limit = memory_limit
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        # Bytes on disk as of the last scan plus what was written since (None until the first write)
+        self.disk_bytes = None
+        self.lock = threading.Lock()
+        # Lookups served from memory, from the disk cache, and neither (made afresh or no cover)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def path_for(self, cover_path):
+        return os.path.join(self.directory, hashlib.sha1(cover_path.encode()).hexdigest() + ".webp")
+
+    def put(self, cover_path, data):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path_for(cover_path), "wb") as file:
+            file.write(data)
+        self._remember(cover_path, data)
+        self._trim_disk(len(data))
+
+    @timed("thumbnails: get")
+    def get(self, cover_path):
+        if not cover_path:
+            return None
+        with self.lock:
+            data = self.memory.get(cover_path)
+            if data is not None:
+                self.memory.move_to_end(cover_path)
+                self.hits += 1
+                return data
+        data = self._read_disk(cover_path)
+        if data is not None:
+            self._remember(cover_path, data)
+            with self.lock:
+                self.disk_hits += 1
+            return data
+        with self.lock:
+            self.misses += 1
+        if not os.path.exists(cover_path):
+            return None
+        try:
+            data = make_thumbnail(cover_path)
+        except OSError:
+            return None
+        self.put(cover_path, data)
+        return data
+
+    # The thumbnail on disk, unless it is older than the cover or gone (another session's
+    # put may evict it at any moment)
+    def _read_disk(self, cover_path):
+        thumb_path = self.path_for(cover_path)
+        try:
+            if os.path.exists(cover_path) and os.path.getmtime(thumb_path) < os.path.getmtime(cover_path):
+                return None
+            with open(thumb_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(thumb_path)  # Mark as recently used for disk eviction
+        except FileNotFoundError:
+            pass
+        return data
+
+    def _remember(self, cover_path, data):
+        with self.lock:
+            old = self.memory.pop(cover_path, None)
+            if old is not None:
+                self.memory_bytes -= len(old)
+            self.memory[cover_path] = data
+            self.memory_bytes += len(data)
+            while self.memory_bytes > self.memory_limit and len(self.memory) > 1:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+
+    # Evict the least recently used thumbnails once the directory outgrows disk_limit. The
+    # directory is only scanned when the running count of bytes written says it may have.
+    def _trim_disk(self, written):
+        with self.lock:
+            if self.disk_bytes is not None:
+                self.disk_bytes += written
+                if self.disk_bytes <= self.disk_limit:
+                    return
+            entries = []
+            for entry in os.scandir(self.directory):
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                except FileNotFoundError:
+                    continue
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.disk_limit:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self.disk_bytes = total
+
+    def data_uri(self, cover_path):
+        data = self.get(cover_path)
+        return "data:image/webp;base64," + base64.b64encode(data).decode() if data else None
+
+    # Lookup counts by result, and the share served from either cache
+    def counts(self):
+        return {(("result", "memory"),): self.hits, (("result", "disk"),): self.disk_hits, (("result", "miss"),): self.misses}
+
+    def hit_ratio(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else None
+
+@st.cache_resource
+def thumbnail_cache():
+    cache = ThumbnailCache(THUMBS_DIR, THUMB_DISK_LIMIT, THUMB_MEMORY_LIMIT)
+    metrics_registry.collect("library_thumbnail_requests_total", cache.counts)
+    metrics_registry.collect("library_thumbnail_hit_ratio", cache.hit_ratio)
+    return cache
+
+# 64-bit difference hash of an image: whether each pixel of a 9x8 grayscale version is
+# brighter than its right neighbour. Resized or recompressed copies differ in only a few bits.
+@timed("covers: hash")
+def cover_hash(source):
+    from PIL import Image, ImageOps
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("L").resize((9, 8), Image.LANCZOS)
+        pixels = np.asarray(image, dtype=np.int16)
+    return int.from_bytes(np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes(), "big")
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+# Multi-index hashing: each 64-bit hash is filed under its four 16-bit chunks. Two hashes
+# within distance r agree to within r // 4 bits on at least one chunk, so a search looks up
+# each chunk's few near variants and verifies only the hashes found there.
+class MultiIndexHash:
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self):
+        self.items = defaultdict(set)
+        self.tables = [defaultdict(set) for _ in range(self.CHUNKS)]
+
+    def chunks(self, value):
+        mask = (1 << self.CHUNK_BITS) - 1
+        return [(value >> (i * self.CHUNK_BITS)) & mask for i in range(self.CHUNKS)]
+
+    def add(self, value, item):
+        if value not in self.items:
+            for table, chunk in zip(self.tables, self.chunks(value)):
+                table[chunk].add(value)
+        self.items[value].add(item)
+
+    def discard(self, value, item):
+        items = self.items.get(value)
+        if items is None:
+            return
+        items.discard(item)
+        if not items:
+            del self.items[value]
+            for table, chunk in zip(self.tables, self.chunks(value)):
+                table[chunk].discard(value)
+                if not table[chunk]:
+                    del table[chunk]
+
+    # Every chunk-sized mask with at most bits bits set
+    @staticmethod
+    def flips(bits, width=CHUNK_BITS):
+        return [sum(1 << bit for bit in combination)
+                for count in range(bits + 1) for combination in itertools.combinations(range(width), count)]
+
+    # (distance, item) for every item within radius of value
+    def search(self, value, radius):
+        flips = self.flips(radius // self.CHUNKS)
+        candidates = set()
+        for table, chunk in zip(self.tables, self.chunks(value)):
+            for flip in flips:
+                candidates.update(table.get(chunk ^ flip, ()))
+        results = []
+        for candidate in candidates:
+            distance = hamming(value, candidate)
+            if distance <= radius:
+                results.extend((distance, item) for item in self.items[candidate])
+        return results
+
+# Perceptual hashes of the stored covers, keyed by cover path. Covers are hashed once, at
+# upload, and persisted to COVER_HASHES_FILE; covers that arrive by import or predate the
+# index are hashed on the first search after they appear.
+class CoverIndex:
+    def __init__(self, path):
+        self.path = path
+        self.hashes = {}
+        self.lookup = MultiIndexHash()
+        self.lock = threading.Lock()
+        self.synced_version = None
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Torn last line
+                    self._index(record["cover"], int(record["hash"], 16))
+
+    def _index(self, cover_path, value):
+        old = self.hashes.get(cover_path)
+        if old is not None:
+            self.lookup.discard(old, cover_path)
+        self.hashes[cover_path] = value
+        self.lookup.add(value, cover_path)
+
+    def put(self, cover_path, value):
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as file:
+                file.write(json.dumps({"cover": cover_path, "hash": f"{value:016x}"}) + "\n")
+            self._index(cover_path, value)
+
+    # Hash the library's covers that are not indexed yet (checked once per library version)
+    @timed("covers: index sync")
+    def sync(self, storage):
+        if self.synced_version == storage.version:
+            return
+        version = storage.version
+        for cover_path in storage.covers() - self.hashes.keys():
+            try:
+                self.put(cover_path, cover_hash(cover_path))
+            except OSError:
+                pass  # Missing or unreadable cover file
+        self.synced_version = version
+
+    @timed("covers: index search")
+    def search(self, value, radius):
+        with self.lock:
+            return sorted(self.lookup.search(value, radius))
+
+@st.cache_resource
+def cover_index():
+    return CoverIndex(COVER_HASHES_FILE)
+
+# Books whose covers look like the given image, as (book, similarity) pairs, closest first
+@timed("covers: find", "library_search_seconds", type="cover")
+def find_covers(source, max_distance=COVER_MATCH_DISTANCE):
+    storage = shared_storage()
+    index = cover_index()
+    index.sync(storage)
+    distances = {cover_path: distance for distance, cover_path in index.search(cover_hash(source), max_distance)}
+    matches = [(book, 1 - distances[book["cover"]] / 64) for book in storage.by_covers(list(distances))]
+    return sorted(matches, key=lambda match: (-match[1], match[0]["id"]))
+
+# Turn one imported row into a Book (None for rows without a title)
+def normalize_book(row):
+    row = {str(key).strip().lower(): value for key, value in row.items()}
+    title = text_field(row.get("title")).strip()
+    if not title:
+        return None
+    read = row.get("read")
+    if isinstance(read, str):
+        read = read.strip().lower() in ("true", "yes", "1", "read", "✔️ read")
+    else:
+        read = bool(read) and read == read
+    text = lambda field: text_field(row.get(field)).strip()
+    return Book(title, text("author"), year_field(row.get("year")), text("genre"), read, text("cover"))
+
+# CSV rows in chunks of IMPORT_CHUNK_ROWS, with the fraction of the file read so far
+def read_csv_chunks(uploaded_file):
+    import pandas as pd
+    size = max(uploaded_file.size, 1)
+    for df in pd.read_csv(uploaded_file, chunksize=IMPORT_CHUNK_ROWS, dtype=str, keep_default_na=False):
+        yield df.to_dict(orient="records"), min(uploaded_file.tell() / size, 1.0)
+
+# Excel rows in chunks of IMPORT_CHUNK_ROWS, streamed by openpyxl's read-only mode
+def read_excel_chunks(uploaded_file):
+    from openpyxl import load_workbook
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        chunk, done = [], 0
+        for values in rows:
+            chunk.append(dict(zip(header, values)))
+            if len(chunk) == IMPORT_CHUNK_ROWS:
+                done += len(chunk)
+                yield chunk, min(done / total_rows, 1.0)
+                chunk = []
+        if chunk:
+            yield chunk, 1.0
+    finally:
+        workbook.close()
+
+# Books from a text file of "title - author - year - genre" lines
+@timed("import: read text")
+def read_text_books(uploaded_file):
+    books = []
+    for line in uploaded_file.read().decode("utf-8").split("\n"):
+        if line.strip():
+            title, author, year, genre = line.split(" - ")
+            books.append(Book(title.strip(), author.strip(), int(year.strip()), genre.strip(), False, ""))
+    return books
+
+# Write an export file book by book, without building the whole payload in memory
+@timed("export: write")
+def write_export(export_format, books, path):
+    if export_format == "CSV":
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(books)
+    elif export_format == "Excel":
+        import xlsxwriter
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        sheet = workbook.add_worksheet("Library")
+        sheet.write_row(0, 0, EXPORT_FIELDS)
+        for row, book in enumerate(books, start=1):
+            sheet.write_row(row, 0, [book.get(field, "") for field in EXPORT_FIELDS])
+        workbook.close()
+    elif export_format == "JSON":
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("[")
+            for i, book in enumerate(books):
+                file.write(",\n" if i else "\n")
+                file.write(textwrap.indent(json.dumps(dict(book), indent=4), "    "))
+            file.write("\n]" if books else "]")
+    elif export_format == "Text":
+        with open(path, "w", encoding="utf-8") as file:
+            for i, book in enumerate(books):
+                file.write(("\n" if i else "") + f"{book['title']} by {book['author']} ({book['year']}) - {book['genre']}")
+
+# Export files already written, per format, with the library version they were written at
+@st.cache_resource
+def export_state():
+    return {"locks": {export_format: threading.Lock() for export_format in EXPORT_FORMATS}, "files": {}}
+
+# Contents of the export in this format, written only when the library changed since the last
+# one. Each format has one file in EXPORTS_DIR under its download name, replaced whole once
+# written, and its own lock, so a download only waits for a write of the same format.
+@timed("export: file")
+def export_bytes(export_format):
+    storage = shared_storage()
+    state = export_state()
+    path = os.path.join(EXPORTS_DIR, EXPORT_FORMATS[export_format][0])
+    with state["locks"][export_format]:
+        with storage.lock:
+            version = storage.version
+            fresh = state["files"].get(export_format) == version and os.path.exists(path)
+            if not fresh:
+                books = storage.books()
+        if not fresh:
+            os.makedirs(EXPORTS_DIR, exist_ok=True)
+            write_export(export_format, books, path + ".tmp")
+            os.replace(path + ".tmp", path)
+            state["files"][export_format] = version
+    with open(path, "rb") as file:
+        return file.read()
+
+# Replace the library with the streamed rows. The storage stages each chunk as it is read and
+# only swaps the staged library in once the whole file has parsed, so a bad row anywhere
+# leaves the library as it was, and memory holds one chunk of rows at a time. storage
+# defaults to the shared one.
+@timed("import: chunks")
+def import_chunks(chunks, progress, on_duplicate=DUPLICATE_POLICY, storage=None):
+    storage = shared_storage() if storage is None else storage
+    start = time.perf_counter()
+    counts = {"books": 0, "skipped": 0}
+    def books():
+        for rows, fraction in chunks:
+            books = [book for book in map(normalize_book, rows) if book is not None]
+            counts["books"] += len(books)
+            counts["skipped"] += len(rows) - len(books)
+            yield books
+            progress.progress(fraction, text=f"📥 Read {counts['books']} books...")
+    duplicates = storage.replace_chunks(books(), on_duplicate)
+    imported, skipped = counts["books"] - duplicates, counts["skipped"]
+    progress.progress(1.0, text=f"📥 Imported {imported} books")
+    record_import(imported + skipped + duplicates, time.perf_counter() - start)
+    return imported, skipped, duplicates
+
+# Add already parsed books (JSON and text imports) to the library; returns the duplicate count
+@timed("import: books")
+def import_books(books, on_duplicate=DUPLICATE_POLICY):
+    start = time.perf_counter()
+    duplicates = shared_storage().add_many(books, on_duplicate)
+    record_import(len(books), time.perf_counter() - start)
+    return duplicates
+
+def record_import(rows, seconds):
+    metrics_registry.inc("library_import_rows_total", rows)
+    metrics_registry.inc("library_import_seconds_total", seconds)
+    if seconds > 0:
+        metrics_registry.set("library_import_rows_per_second", rows / seconds)
+
+
+# Sessions connected to this server, as Streamlit's session manager counts them. Streamlit
+# has no public API for this, so the runtime's private manager is only read on the versions
+# in SESSION_COUNT_VERSIONS; None on any other, in bare scripts and under AppTest, whose mock
+# runtime has no real session manager
+def active_sessions():
+    from streamlit import runtime
+    version = tuple(int(part) for part in st.__version__.split(".")[:2] if part.isdigit())
+    if not SESSION_COUNT_VERSIONS[0] <= version <= SESSION_COUNT_VERSIONS[1] or not runtime.exists():
+        return None
+    session_manager = getattr(runtime.get_instance(), "_session_mgr", None)
+    count = session_manager.num_active_sessions() if session_manager is not None else None
+    return count if isinstance(count, int) else None
+
+# The /metrics endpoint: a small HTTP server on its own daemon thread, started once per server
+# process by the first script run. Returns None when it is turned off or the port is taken
+# (e.g. by a second app on the same machine).
+@st.cache_resource
+def metrics_server():
+    if METRICS_PORT is None:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics_registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((METRICS_ADDRESS, METRICS_PORT), MetricsHandler)
+    except OSError as error:
+        print(f"Metrics endpoint not started on {METRICS_ADDRESS}:{METRICS_PORT}: {error}", file=sys.stderr)
+        return None
+    server.daemon_threads = True
+    metrics_registry.collect("library_active_sessions", active_sessions)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+# Convert a snapshot between the formats from the command line (the journal is left as it is):
+#     python library_core.py library.json library.snapshot
+#     python library_core.py library.snapshot library.json
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert a library snapshot between JSON and the binary format.")
+    parser.add_argument("source", help="library.json or a binary snapshot")
+    parser.add_argument("target", help="written as JSON if it ends in .json, as a binary snapshot otherwise")
+    args = parser.parse_args()
+    print(f"{convert_snapshot(args.source, args.target)} books written to {args.target}")
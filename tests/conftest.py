@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import library_core as core  # noqa: E402
+
+
+# A scratch directory for the library files, with fresh journal state and no fsyncs
+@pytest.fixture
+def library_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(core, "JOURNAL_SYNC", "off")
+    core.journal_state.clear()
+    yield tmp_path
+    core.journal_state.clear()
@@ -0,0 +1,46 @@
+import pytest
+
+import library_core as core
+
+ROWS = [{"Title": "A", "author": "X", "year": "1999"}, {"title": "B", "author": "Y", "year": 1e400},
+        {"title": "C", "year": "1e30"}, {"title": " a ", "author": "x", "year": "1999.0"},
+        {"title": "D", "year": "-inf"}, {"title": float("nan")}]
+
+
+class Progress:
+    def progress(self, fraction, text=None):
+        pass
+
+
+def storage(backend):
+    return core.JsonStorage() if backend == "json" else core.SqliteStorage(core.SQLITE_FILE)
+
+
+def test_normalize_book_clamps_years():
+    assert [core.normalize_book(row) for row in ROWS[:3]] == [
+        core.Book("A", "X", 1999, "", False, ""), core.Book("B", "Y", 0, "", False, ""),
+        core.Book("C", "", 2 ** 63 - 1, "", False, "")]
+    assert core.normalize_book(ROWS[4]).year == 0
+    assert core.normalize_book(ROWS[5]) is None
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_chunked_import_resolves_duplicates_across_chunks(library_dir, monkeypatch, backend):
+    library = storage(backend)
+    monkeypatch.setattr(core, "shared_storage", lambda: library)
+    chunks = [(ROWS[:2], 0.5), (ROWS[2:], 1.0)]
+    assert core.import_chunks(iter(chunks), Progress(), "merge") == (4, 1, 1)
+    assert sorted((book.title, book.year) for book in library.books()) == [("A", 1999), ("B", 0), ("C", 2 ** 63 - 1), ("D", 0)]
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_failed_import_leaves_the_library_as_it_was(library_dir, monkeypatch, backend):
+    library = storage(backend)
+    library.add({"title": "Kept", "author": "Author", "year": 2000, "genre": "Fiction"})
+    monkeypatch.setattr(core, "shared_storage", lambda: library)
+    def chunks():
+        yield ROWS[:2], 0.5
+        raise ValueError("bad row")
+    with pytest.raises(ValueError):
+        core.import_chunks(chunks(), Progress())
+    assert [book.title for book in library.books()] == ["Kept"]
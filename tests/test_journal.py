@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+
+import library_core as core
+
+
+def book(title, book_id, **fields):
+    return {"title": title, "author": "Author", "year": 2000, "genre": "Fiction", "read": False, "cover": "",
+            "id": book_id, **fields}
+
+
+def lines(*records):
+    return [json.dumps(record) + "\n" for record in records]
+
+
+def titles(library):
+    return [book.title for book in library]
+
+
+def test_replay_adds_and_stops_at_a_torn_last_line():
+    journal = lines({"op": "add", "book": book("A", 1)}, {"op": "add", "book": book("B", 2)})
+    journal.append('{"op": "add", "book": {"title": "C"')
+    assert titles(core.replay_journal([], journal)) == ["A", "B"]
+
+
+def test_replay_removes_by_id_and_by_title():
+    library = [core.Book.from_dict(book(title, book_id)) for book_id, title in enumerate("ABCDE", start=1)]
+    journal = lines({"op": "remove", "ids": [2, 4, 99]}, {"op": "remove", "title": "E"},
+                    {"op": "add", "book": book("F", 6)}, {"op": "remove", "ids": [6]})
+    assert titles(core.replay_journal(library, journal)) == ["A", "C"]
+
+
+def test_replay_updates_in_place():
+    library = [core.Book.from_dict(book("A", 1)), core.Book.from_dict(book("B", 2))]
+    old = library[1]
+    journal = lines({"op": "update", "id": 2, "changes": {"title": "B2", "read": True}},
+                    {"op": "update", "id": 99, "changes": {"title": "missing"}})
+    replayed = core.replay_journal(library, journal)
+    assert titles(replayed) == ["A", "B2"]
+    assert replayed[1].read and replayed[1].id == 2
+    assert old.title == "B"  # Replaced, not mutated
+
+
+def test_replay_after_a_crash_skips_adds_the_snapshot_already_holds():
+    # A crash between writing the snapshot and resetting the journal replays the journal over
+    # a snapshot that already contains its adds
+    library = [core.Book.from_dict(book("A", 1)), core.Book.from_dict(book("B", 2))]
+    journal = lines({"op": "add", "book": book("A", 1)}, {"op": "add", "book": book("B", 2)},
+                    {"op": "add", "book": book("C", 3)})
+    assert titles(core.replay_journal(library, journal)) == ["A", "B", "C"]
+
+
+def test_storage_round_trip_through_the_journal(library_dir):
+    storage = core.JsonStorage()
+    storage.add_many([{"title": f"Book {i}", "author": "Author", "year": 2000 + i, "genre": "Fiction"} for i in range(5)])
+    storage.remove_many([2])
+    assert os.path.exists(core.JOURNAL_FILE)
+    core.journal_state.clear()
+    assert sorted(book.title for book in core.load_library()) == ["Book 0", "Book 2", "Book 3", "Book 4"]
+
+
+def test_compaction_keeps_records_appended_while_it_runs(library_dir, monkeypatch):
+    monkeypatch.setattr(core, "JOURNAL_COMPACT_EVERY", 10 ** 6)
+    storage = core.JsonStorage()
+    storage.add_many([{"title": f"Before {i}", "author": "Author", "year": 2000, "genre": "Fiction"} for i in range(3)])
+
+    # Another session writes between the compaction reading the journal and swapping files
+    replay = core.replay_journal
+    def replay_then_append(library, journal):
+        storage.add({"title": "During", "author": "Author", "year": 2000, "genre": "Fiction"})
+        return replay(library, journal)
+    monkeypatch.setattr(core, "replay_journal", replay_then_append)
+    core.compact_library()
+    monkeypatch.setattr(core, "replay_journal", replay)
+
+    with open(core.JOURNAL_FILE) as file:
+        tail = [json.loads(line) for line in file if line.strip()]
+    assert [record["book"]["title"] for record in tail] == ["During"]
+    assert core.journal_state()["records"] == 1
+    assert sorted(book.title for book in core.read_snapshot_file(core.current_snapshot())) == ["Before 0", "Before 1", "Before 2"]
+    core.journal_state.clear()
+    assert sorted(book.title for book in core.load_library()) == ["Before 0", "Before 1", "Before 2", "During"]
+
+
+def test_compaction_gives_way_to_a_full_save(library_dir, monkeypatch):
+    storage = core.JsonStorage()
+    storage.add({"title": "Journaled", "author": "Author", "year": 2000, "genre": "Fiction"})
+
+    replay = core.replay_journal
+    def replay_then_save(library, journal):
+        storage.replace([{"title": "Saved", "author": "Author", "year": 2000, "genre": "Fiction"}])
+        return replay(library, journal)
+    monkeypatch.setattr(core, "replay_journal", replay_then_save)
+    core.compact_library()
+    monkeypatch.setattr(core, "replay_journal", replay)
+
+    assert not [name for name in os.listdir(".") if name.endswith(".tmp")]
+    core.journal_state.clear()
+    assert titles(core.load_library()) == ["Saved"]
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary", "both"])
+def test_compaction_round_trip_in_each_snapshot_format(library_dir, monkeypatch, snapshot_format):
+    monkeypatch.setattr(core, "SNAPSHOT_FORMAT", snapshot_format)
+    storage = core.JsonStorage()
+    storage.add_many([{"title": f"Book {i}", "author": "Author", "year": 2000, "genre": "Fiction"} for i in range(20)])
+    storage.remove_many([3, 5])
+    core.compact_library()
+    core.journal_state.clear()
+    reopened = core.JsonStorage()
+    assert sorted(reopened.books(), key=lambda book: book.id) == sorted(storage.books(), key=lambda book: book.id)
+
+
+def test_a_newer_library_json_does_not_override_the_binary_snapshot(library_dir, monkeypatch):
+    monkeypatch.setattr(core, "SNAPSHOT_FORMAT", "json")
+    core.save_library([core.Book.from_dict(book("Old", 1))])
+    monkeypatch.setattr(core, "SNAPSHOT_FORMAT", "binary")
+    # The first load migrates library.json; the first save retires it
+    assert titles(core.load_library()) == ["Old"]
+    core.save_library([core.Book.from_dict(book("New", 1))])
+    assert not os.path.exists(core.LIBRARY_FILE)
+    assert os.path.exists(core.LIBRARY_FILE + ".migrated")
+    # A stale copy put back with a fresh modification time, as a restore or a checkout would
+    os.replace(core.LIBRARY_FILE + ".migrated", core.LIBRARY_FILE)
+    os.utime(core.LIBRARY_FILE, ns=(2 ** 62, 2 ** 62))
+    assert titles(core.load_library()) == ["New"]
+
+
+def test_compaction_migrates_to_the_other_format(library_dir, monkeypatch):
+    core.save_library([core.Book.from_dict(book("A", 1))])
+    monkeypatch.setattr(core, "SNAPSHOT_FORMAT", "json")
+    storage = core.JsonStorage()
+    storage.add({"title": "B", "author": "Author", "year": 2000, "genre": "Fiction"})
+    core.compact_library()
+    assert not os.path.exists(core.SNAPSHOT_FILE)
+    core.journal_state.clear()
+    assert titles(core.read_snapshot_file(core.current_snapshot())) == ["A", "B"]
@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+import library_core as core
+
+BOOKS = [
+    core.Book("Plain", "Author", 1999, "Fiction", False, "", 1),
+    core.Book("Ünïcödé — 日本語 📚", "Émile Zola", 1885, "Classic", True, "covers/é.png", 2),
+    core.Book("Has a \0 NUL", "Author\0Two", 2001, "Fi\0ction", False, "covers/\0.png", 3),
+    core.Book("", "", 0, "", False, "", None),
+]
+
+
+def snapshot_bytes(library):
+    file = io.BytesIO()
+    core.write_binary_snapshot(library, file)
+    return file.getvalue()
+
+
+def round_trip(library):
+    return core.read_binary_snapshot(io.BytesIO(snapshot_bytes(library)))
+
+
+def test_binary_round_trip_keeps_every_field():
+    assert round_trip(BOOKS) == BOOKS
+
+
+def test_binary_round_trip_of_dicts_and_of_a_book_table():
+    assert round_trip([book.to_dict() for book in BOOKS[:3]]) == BOOKS[:3]
+    assert round_trip(core.BookTable(BOOKS[:3])) == BOOKS[:3]
+
+
+@pytest.mark.parametrize("library", [[], [core.Book("", "", 0, "", False, "", 7)]])
+def test_binary_round_trip_of_empty_libraries_and_strings(library):
+    assert round_trip(library) == library
+
+
+def test_columns_are_aligned_and_offsets_only_written_for_nul():
+    columns, header = core.snapshot_columns(snapshot_bytes(BOOKS))
+    assert header["books"] == len(BOOKS)
+    assert all(offset % 8 == 0 for offset, _, _ in header["columns"].values())
+    assert "title.offsets" in columns
+    assert "title.offsets" not in core.snapshot_columns(snapshot_bytes(BOOKS[:2]))[0]
+
+
+def test_rejects_other_files_and_newer_versions():
+    with pytest.raises(ValueError):
+        core.snapshot_columns(b"[]")
+    data = bytearray(snapshot_bytes(BOOKS))
+    data[len(core.SNAPSHOT_MAGIC)] = core.SNAPSHOT_VERSION + 1
+    with pytest.raises(ValueError):
+        core.snapshot_columns(bytes(data))
+
+
+def test_snapshot_files_are_read_by_their_format(library_dir):
+    with open(core.LIBRARY_FILE, "w") as file:
+        core.write_snapshot(BOOKS, file)
+    assert core.convert_snapshot(core.LIBRARY_FILE, core.SNAPSHOT_FILE) == len(BOOKS)
+    assert core.read_snapshot_file(core.SNAPSHOT_FILE) == core.read_snapshot_file(core.LIBRARY_FILE) == BOOKS
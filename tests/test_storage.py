@@ -0,0 +1,29 @@
+import sqlite3
+
+import pytest
+
+import library_core as core
+
+
+def test_sqlite_fills_in_duplicate_keys_of_older_databases(library_dir):
+    conn = sqlite3.connect(core.SQLITE_FILE)
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT NOT NULL, author TEXT NOT NULL, "
+                 "year INTEGER NOT NULL DEFAULT 0, genre TEXT NOT NULL DEFAULT '', read INTEGER NOT NULL DEFAULT 0, "
+                 "cover TEXT NOT NULL DEFAULT '')")
+    conn.executemany("INSERT INTO books (title, author, year) VALUES (?, ?, ?)", [("Dune", "Herbert", 1965), ("Emma", "Austen", 1815)])
+    conn.commit()
+    conn.close()
+    storage = core.SqliteStorage(core.SQLITE_FILE)
+    assert storage.duplicate_of(core.Book(" dune ", "HERBERT", 1965)) == 1
+    storage.remove(1)
+    assert storage.duplicate_of(core.Book("Dune", "Herbert", 1965)) is None
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+@pytest.mark.parametrize("policy, genre", [("skip", "Novel"), ("merge", "Novel"), ("replace", "Classic")])
+def test_add_applies_the_duplicate_policy(library_dir, backend, policy, genre):
+    storage = core.JsonStorage() if backend == "json" else core.SqliteStorage(core.SQLITE_FILE)
+    assert storage.add({"title": "Emma", "author": "Austen", "year": 1815, "genre": "Novel"}, policy) == 0
+    assert storage.add({"title": "emma", "author": "Austen", "year": 1815, "genre": "Classic", "cover": "c.png"}, policy) == 1
+    (book,) = storage.books()
+    assert (book.genre, book.cover) == (genre, "" if policy == "skip" else "c.png")
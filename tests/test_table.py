@@ -0,0 +1,37 @@
+import random
+
+import numpy as np
+import pytest
+
+import library_core as core
+
+
+def books(ids, rng):
+    return [core.Book(rng.choice(["A", "B", "C", "D"]), rng.choice(["X", "Y"]), rng.choice([1990, 2000]), "Fiction",
+                      False, "", book_id) for book_id in ids]
+
+
+def fresh_order(table, sort_by):
+    return [int(table.ids[position]) for position in core.BookTable(list(table)).order(sort_by)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_patched_orders_match_a_fresh_sort(seed):
+    rng = random.Random(seed)
+    table = core.BookTable(books(range(1, 41), rng))
+    next_id = 41
+    for step in range(30):
+        if step % 3 == 0:
+            for sort_by in ("title", "author", "year"):
+                order = table.order(sort_by)
+                assert [int(table.ids[position]) for position in order] == fresh_order(table, sort_by)
+                assert len(np.unique(order)) == len(table)
+        if rng.random() < 0.5 and len(table):
+            for book_id in rng.sample(sorted(table.positions), min(len(table), rng.randint(1, 6))):
+                table.remove(book_id)
+        else:
+            count = rng.randint(1, 6)
+            table.append(books(range(next_id, next_id + count), rng))
+            next_id += count
+    for sort_by in ("title", "author", "year"):
+        assert [int(table.ids[position]) for position in table.order(sort_by)] == fresh_order(table, sort_by)